@@ -0,0 +1,119 @@
+# Artify — capa HTTP asyncio (alternativa a un thread por request)
+# Un event loop en un thread propio, una ClientSession de aiohttp y semáforos global + por host: cientos de
+# requests en vuelo sin un thread bloqueado por cada uno. Misma política que net (reintentos, pools por host,
+# contadores de requests/conexiones) y las mismas excepciones de requests, así el motor no distingue.
+# aiohttp es opcional: sin él, available() da False y todo sigue por net.
+
+import time, atexit, random, asyncio, threading
+from contextlib import asynccontextmanager
+from urllib.parse import urlparse
+
+import requests
+
+try: import aiohttp
+except ImportError: aiohttp = None
+
+import net
+from net import _bump
+from metrics import timing
+
+AIO_MAX_INFLIGHT = 256   # requests en vuelo en total
+AIO_PER_HOST = 8         # por host (con net.POOL_BLOCK, HOST_POOLS pisa esto como en net; la cortesía del crawl va aparte)
+
+def available():
+    return aiohttp is not None
+
+class AioResponse:
+    # lo que el motor usa de requests.Response: status_code, headers, url, iter_content, raise_for_status
+    __slots__=("_r","status_code","headers","url")
+    def __init__(self, r):
+        self._r=r; self.status_code=r.status; self.headers=r.headers; self.url=str(r.url)
+
+    async def iter_content(self, size:int):
+        try:
+            async for chunk in self._r.content.iter_chunked(size): yield chunk
+        except asyncio.TimeoutError as e: raise requests.ReadTimeout(str(e) or self.url) from e
+        except aiohttp.ClientError as e: raise requests.ConnectionError(str(e)) from e
+
+    def raise_for_status(self):
+        if self.status_code<400: return
+        resp=requests.Response(); resp.status_code=self.status_code; resp.url=self.url
+        raise requests.HTTPError(f"{self.status_code} for url: {self.url}", response=resp)
+
+class AioFetcher:
+    def __init__(self, max_inflight:int=None, per_host:int=None):
+        self.max_inflight=max_inflight or AIO_MAX_INFLIGHT; self.per_host=per_host or AIO_PER_HOST
+        self.loop=asyncio.new_event_loop()
+        self._thread=threading.Thread(target=self.loop.run_forever, name="aionet", daemon=True); self._thread.start()
+        self._session=None; self._all=None; self._hosts={}
+        self.inflight=0; self.peak=0
+
+    def submit(self, coro):
+        # desde cualquier thread → concurrent.futures.Future
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run(self, coro, timeout:float=None):
+        return self.submit(coro).result(timeout)
+
+    def _sem(self, host:str):
+        s=self._hosts.get(host)
+        if s is None:
+            n=net.HOST_POOLS.get(host, self.per_host) if net.POOL_BLOCK else self.per_host
+            s=self._hosts[host]=asyncio.Semaphore(n)
+        return s
+
+    def _new_session(self):
+        trace=aiohttp.TraceConfig()
+        async def req_start(_s, ctx, p): ctx.host=p.url.host or ""
+        async def conn_start(_s, ctx, _p): ctx.t=time.perf_counter()
+        async def conn_end(_s, ctx, _p):
+            _bump(ctx.host, "connections"); timing("fetch.connect", ctx.host, time.perf_counter()-ctx.t)
+        trace.on_request_start.append(req_start)
+        trace.on_connection_create_start.append(conn_start); trace.on_connection_create_end.append(conn_end)
+        # sin límites en el connector: los semáforos son los que mandan
+        return aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=0, limit_per_host=0, ttl_dns_cache=300),
+                                     trust_env=True, trace_configs=[trace])
+
+    @asynccontextmanager
+    async def get(self, url:str, headers:dict=None, timeout:float=None):
+        # GET con reintentos (conexión y RETRY_STATUS, con backoff como urllib3); el cuerpo se lee adentro del with
+        if self._session is None:
+            self._session=self._new_session(); self._all=asyncio.Semaphore(self.max_inflight)
+        host=(urlparse(url).hostname or "").lower().replace("www.","")
+        to=aiohttp.ClientTimeout(total=None, connect=timeout, sock_read=timeout)
+        async with self._all, self._sem(host):
+            self.inflight+=1; self.peak=max(self.peak, self.inflight)
+            try:
+                for attempt in range(net.RETRY_TOTAL+1):
+                    last=attempt==net.RETRY_TOTAL
+                    _bump(host, "requests")
+                    try: r=await self._session.get(url, headers=headers, timeout=to, allow_redirects=True)
+                    except asyncio.TimeoutError as e:
+                        if last: raise requests.ConnectTimeout(str(e) or url) from e
+                    except aiohttp.ClientError as e:
+                        if last: raise requests.ConnectionError(str(e)) from e
+                    else:
+                        if last or r.status not in net.RETRY_STATUS: break
+                        retry_after=r.headers.get("Retry-After", "")
+                        r.release()
+                        if retry_after.isdigit():
+                            await asyncio.sleep(min(float(retry_after), timeout or 30)); continue
+                    await asyncio.sleep(net.RETRY_BACKOFF*(2**attempt)*(0.5+random.random()/2))
+                try: yield AioResponse(r)
+                finally: r.release()
+            finally:
+                self.inflight-=1
+
+    def close(self):
+        if self._session is not None: self.run(self._session.close(), 5)
+        self.loop.call_soon_threadsafe(self.loop.stop)
+
+_fetcher=None
+_fetcher_lock=threading.Lock()
+
+def aio_fetcher():
+    global _fetcher
+    with _fetcher_lock:
+        if _fetcher is None and aiohttp is not None:
+            _fetcher=AioFetcher(); atexit.register(_fetcher.close)
+    return _fetcher
@@ -0,0 +1,69 @@
+# Benchmark reproducible, sin red: corpus (sintético o grabado) servido por un proxy local.
+#   python -m bench                                  → crawl, extract y e2e sobre el corpus sintético
+#   python -m bench e2e --latency 0.08 --jitter 0.04 --error-rate 0.02 --slow museosiivori.buenosaires.gob.ar=5
+#   python -m bench --record .bench/corpus           → graba las semillas reales para usar con --corpus
+
+import os, sys, json, argparse
+os.environ["ARTIFY_NO_CACHE"]="1"   # antes de importar el motor: sin cachés ni salud de hosts persistida
+
+from bench import corpus, scenarios
+from bench.server import ReplayServer
+
+COLS = [("scenario","escenario"),("pages","páginas"),("items","items"),("wall_s","wall s"),("pages_per_s","pág/s"),
+        ("p50_ms","p50 ms"),("p95_ms","p95 ms"),("bytes","bytes"),("errors","errores"),("peak_rss_mb","RSS MB")]
+
+def record(path:str, intensity:int):
+    import engine
+    pages={}
+    orig=engine.fetch_bytes
+    def keep(url, *a, **kw):
+        data, ct, final=orig(url, *a, **kw)
+        pages["http://"+url.split("://",1)[1]]=(200, ct, data)
+        return data, ct, final
+    engine.fetch_bytes=keep
+    for _ in engine.Search(intensity): pass
+    corpus.save(pages, path)
+    print(f"{len(pages)} respuestas grabadas en {path}")
+
+def main(argv=None):
+    ap=argparse.ArgumentParser(prog="python -m bench", description="Benchmark offline de crawl / extracción / pipeline completo.")
+    ap.add_argument("scenarios", nargs="*", metavar="escenario", help=f"{', '.join(scenarios.SCENARIOS)} (default: todos)")
+    ap.add_argument("--corpus", default="synthetic", help="'synthetic' o directorio grabado con --record")
+    ap.add_argument("--latency", type=float, default=0.03, help="latencia base por request (s)")
+    ap.add_argument("--jitter", type=float, default=0.01)
+    ap.add_argument("--error-rate", type=float, default=0.0, help="fracción de requests con 503 o conexión cortada")
+    ap.add_argument("--slow", action="append", default=[], metavar="HOST=FACTOR", help="multiplica la latencia de un host")
+    ap.add_argument("--intensity", type=int, default=60)
+    ap.add_argument("--workers", type=int, default=16, help="descargas simultáneas")
+    ap.add_argument("--extract-workers", type=int, default=None, help="procesos de extracción (default: cores-1)")
+    ap.add_argument("--fetch", choices=("threads", "asyncio"), default="threads", help="motor de descargas")
+    ap.add_argument("--per-site-limit", type=int, default=12)
+    ap.add_argument("--json", help="además, guarda los resultados en este archivo")
+    ap.add_argument("--record", metavar="DIR", help="graba un corpus real (usa la red) y termina")
+    args=ap.parse_args(argv)
+    for name in args.scenarios:
+        if name not in scenarios.SCENARIOS: ap.error(f"escenario desconocido: {name}")
+    args.scenarios=args.scenarios or list(scenarios.SCENARIOS)
+
+    if args.record:
+        record(args.record, args.intensity); return 0
+
+    pages=corpus.synthetic() if args.corpus=="synthetic" else corpus.load(args.corpus)
+    slow={h.split("=")[0].replace("www.",""): float(h.split("=")[1]) for h in args.slow}
+    server=ReplayServer(pages, latency=args.latency, jitter=args.jitter, error_rate=args.error_rate, slow_hosts=slow).start()
+    params={"corpus": args.corpus, "intensity": args.intensity, "workers": args.workers, "extract_workers": args.extract_workers, "fetch": args.fetch, "per_site_limit": args.per_site_limit}
+    rows=[]
+    try:
+        for name in args.scenarios:
+            rows.append(scenarios.run(name, server, params))
+            print(" | ".join(f"{label} {rows[-1][k]}" for k, label in COLS), flush=True)
+    finally:
+        server.stop()
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"params": params, "latency": args.latency, "jitter": args.jitter, "error_rate": args.error_rate,
+                       "slow": slow, "results": rows}, f, indent=1)
+    return 0
+
+if __name__=="__main__":
+    sys.exit(main())
@@ -0,0 +1,143 @@
+# Corpus para benchmarks: sintético y determinístico (armado con la forma de las semillas reales) o
+# grabado de la red con `python -m bench --record DIR`. Formato común: {url: (status, content_type, body)}.
+
+import os, json, random, hashlib
+from datetime import date, timedelta
+from urllib.parse import urlparse
+
+from engine import CURATED_AR_SEEDS, AGGREGATOR_HOSTS
+
+LOREM = ("La institución promueve la difusión de las artes visuales contemporáneas en todo el país y acompaña "
+         "a artistas emergentes y consagrados con programas de formación, exhibición y producción. ").split()
+NAV = ["institucional","historia","contacto","prensa","colecciones","agenda","visitas","tienda","mapa-del-sitio",
+       "politica-de-privacidad","terminos","equipo","biblioteca","educacion","publicaciones","amigos"]
+CALL_KINDS = [("Premio", "Concursos"), ("Salón Nacional", "Concursos"), ("Beca de creación", "Becas"),
+              ("Residencia", "Residencias"), ("Convocatoria abierta", "Convocatorias")]
+MONTHS = ["enero","febrero","marzo","abril","mayo","junio","julio","agosto","septiembre","octubre","noviembre","diciembre"]
+
+def http_seeds():
+    # las semillas reales, pero en http: el server de replay actúa de proxy y no hace TLS
+    return ["http://"+s.split("://",1)[1] for s in CURATED_AR_SEEDS]
+
+def _para(rng, n):
+    return " ".join(rng.choice(LOREM) for _ in range(n)).capitalize()+"."
+
+def _page(title, body, desc=""):
+    meta=f'<meta name="description" content="{desc}">' if desc else ""
+    return (f"<!doctype html><html><head><meta charset='utf-8'><title>{title}</title>{meta}</head><body>"
+            f"{body}</body></html>").encode("utf-8")
+
+def _pdf(lines, pad:bytes):
+    # PDF mínimo válido: una página con las líneas en Helvetica + un stream binario de relleno (como una imagen)
+    esc=lambda t: t.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)").encode("cp1252", "replace")
+    content=b"BT /F1 11 Tf 14 TL 50 790 Td "+b" ".join(b"("+esc(l)+b")'" for l in lines)+b" ET"
+    objs=[b"<< /Type /Catalog /Pages 2 0 R >>", b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+          b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] /Resources << /Font << /F1 5 0 R >> >> /Contents 4 0 R >>",
+          b"<< /Length %d >>\nstream\n%s\nendstream" % (len(content), content),
+          b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>",
+          b"<< /Length %d >>\nstream\n%s\nendstream" % (len(pad), pad)]
+    out=b"%PDF-1.4\n"; offs=[]
+    for i, o in enumerate(objs, 1):
+        offs.append(len(out)); out+=b"%d 0 obj\n%s\nendobj\n" % (i, o)
+    xref=len(out)
+    out+=b"xref\n0 %d\n0000000000 65535 f \n" % (len(objs)+1)+b"".join(b"%010d 00000 n \n" % o for o in offs)
+    return out+b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objs)+1, xref)
+
+def _nav(rng):
+    return "<nav>"+" ".join(f"<a href='/{n}'>{n.replace('-',' ').title()}</a>" for n in NAV)+"</nav>"
+
+def _footer(rng):
+    return ("<footer>"+" ".join(f"<a href='/{n}'>{n}</a>" for n in rng.sample(NAV, 8))
+            +" <a href='https://www.instagram.com/x'>IG</a> <a href='mailto:info@x.org'>mail</a></footer>")
+
+def synthetic(seed:int=7, calls_per_host:int=8, news_per_host:int=10, filler_paras:int=25, pdf_kb:int=180):
+    rng=random.Random(seed)
+    pages={}
+    seeds=http_seeds()
+    hosts=[]
+    for s in seeds:
+        p=urlparse(s); base=f"{p.scheme}://{p.netloc}"
+        if base not in hosts: hosts.append(base)
+    call_urls=[]
+    for base in hosts:
+        host=urlparse(base).netloc
+        if any(host.replace("www.","").endswith(h) for h in AGGREGATOR_HOSTS): continue
+        calls=[]
+        for i in range(calls_per_host):
+            name, _=rng.choice(CALL_KINDS); year=2025+rng.randint(0,1)
+            slug=f"/convocatorias/{name.lower().replace(' ','-')}-{year}-{i}"
+            d1=rng.randint(1,28); m1=rng.randint(0,8); d2=rng.randint(1,28); m2=m1+rng.randint(1,3)
+            body=(_nav(rng)+f"<h1>{name} {host.split('.')[1].title()} {year}</h1>"
+                  f"<p>Inscripción abierta del {d1} de {MONTHS[m1]} de {year} al {d2} de {MONTHS[m2]} de {year}.</p>"
+                  f"<p>Premio adquisición de $ {rng.randint(5,90)}.000.000 y {rng.randint(2,12)} finalistas. "
+                  f"{'Sin costo de inscripción.' if rng.random()<.6 else 'Arancel de inscripción $ 5.000.'} Buenos Aires, Argentina.</p>"
+                  + "".join(f"<p>{_para(rng, 40)}</p>" for _ in range(filler_paras))
+                  + f"<a href='/bases-{i}.pdf'>Bases y condiciones</a> <a href='https://forms.gle/{i}{host[:3]}'>Formulario de inscripción</a>"
+                  + _footer(rng))
+            pages[base+slug]=(200, "text/html; charset=utf-8", _page(f"{name} {year} | {host}", body, _para(rng, 25)))
+            bases=[f"Bases y condiciones - {name} {year}", f"La convocatoria cierra el {d2} de {MONTHS[m2]} {year}.",
+                   f"Inscripción del {d1} de {MONTHS[m1]} de {year} al {d2} de {MONTHS[m2]} de {year}.",
+                   "Podrán participar artistas argentinos o residentes en Argentina."]
+            pages[f"{base}/bases-{i}.pdf"]=(200, "application/pdf", _pdf(bases, rng.randbytes(pdf_kb*1024)))
+            calls.append(slug)
+        news=[]
+        for i in range(news_per_host):
+            slug=f"/noticias/nota-{i}"
+            body=_nav(rng)+f"<h1>Nota {i}</h1>"+"".join(f"<p>{_para(rng, 50)}</p>" for _ in range(filler_paras))+_footer(rng)
+            pages[base+slug]=(200, "text/html; charset=utf-8", _page(f"Nota {i} | {host}", body))
+            news.append(slug)
+        for n in NAV:
+            body=_nav(rng)+f"<h1>{n.title()}</h1>"+"".join(f"<p>{_para(rng, 50)}</p>" for _ in range(filler_paras//2))+_footer(rng)
+            pages[f"{base}/{n}"]=(200, "text/html; charset=utf-8", _page(f"{n.title()} | {host}", body))
+        listing=_nav(rng)+"<h1>Convocatorias</h1>"+"".join(f"<a href='{c}'>Ver convocatoria {k}</a> " for k, c in enumerate(calls))+_footer(rng)
+        pages[base+"/convocatorias"]=(200, "text/html; charset=utf-8", _page("Convocatorias", listing))
+        home=(_nav(rng)+"<h1>Inicio</h1>"+"".join(f"<a href='{n}'>Noticia</a> " for n in news)
+              +"<a href='/convocatorias'>Convocatorias</a> "+"".join(f"<a href='{c}'>Destacado</a> " for c in rng.sample(calls, 3))
+              +"".join(f"<p>{_para(rng, 40)}</p>" for _ in range(filler_paras//2))+_footer(rng))
+        pages[base+"/"]=(200, "text/html; charset=utf-8", _page(f"Inicio | {host}", home))
+        call_urls+=[base+c for c in calls]
+        if len(call_urls)//calls_per_host%2:   # la mitad de los hosts publica robots.txt + sitemap con lastmod
+            urls=[("/", 1)]+[(c, 10+k) for k, c in enumerate(calls)]+[(n, 300+k) for k, n in enumerate(news)]+[("/"+n, 900) for n in NAV]
+            sm="".join(f"<url><loc>{base}{u}</loc><lastmod>{date.today()-timedelta(days=d)}</lastmod></url>" for u, d in urls)
+            pages[base+"/sitemap.xml"]=(200, "application/xml", ('<?xml version="1.0" encoding="UTF-8"?>'
+                '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'+sm+"</urlset>").encode())
+            pages[base+"/robots.txt"]=(200, "text/plain", f"User-agent: *\nDisallow: /wp-admin/\nSitemap: {base}/sitemap.xml\n".encode())
+
+    # agregadores: listados con links externos (a hosts del corpus y a hosts que no existen → 404)
+    for s in seeds:
+        p=urlparse(s); base=f"{p.scheme}://{p.netloc}"
+        if not any(p.netloc.replace("www.","").endswith(h) for h in AGGREGATOR_HOSTS): continue
+        ext=rng.sample(call_urls, min(12, len(call_urls)))+[f"http://museo{i}.example.org/convocatoria-{i}" for i in range(4)]
+        arts=[]
+        for i in range(6):
+            slug=f"/articulo/convocatoria-{i}"
+            body=_nav(rng)+f"<h1>Convocatoria {i}: salón de arte</h1>"+"".join(f"<p>{_para(rng, 40)}</p>" for _ in range(filler_paras))+_footer(rng)
+            pages[base+slug]=(200, "text/html; charset=utf-8", _page(f"Convocatoria {i}", body))
+            arts.append(slug)
+        listing=(_nav(rng)+"<h1>Convocatorias</h1>"
+                 +"".join(f"<a href='{u}'>Convocatoria premio {k}</a> " for k, u in enumerate(ext))
+                 +"".join(f"<a href='{a}'>Leer</a> " for a in arts)+_footer(rng))
+        pages[s]=(200, "text/html; charset=utf-8", _page("Convocatorias", listing))
+        if base+"/" not in pages:
+            pages[base+"/"]=(200, "text/html; charset=utf-8", _page("Inicio", _nav(rng)+f"<a href='{p.path}'>Convocatorias</a>"))
+    return pages
+
+# ───────── Corpus grabado (directorio con manifest.json + cuerpos por sha1)
+def save(pages:dict, path:str):
+    os.makedirs(path, exist_ok=True)
+    manifest={}
+    for url, (status, ct, body) in pages.items():
+        name=hashlib.sha1(body).hexdigest()
+        with open(os.path.join(path, name), "wb") as f: f.write(body)
+        manifest[url]={"status": status, "content_type": ct, "file": name}
+    with open(os.path.join(path, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=1, ensure_ascii=False)
+
+def load(path:str):
+    with open(os.path.join(path, "manifest.json"), encoding="utf-8") as f:
+        manifest=json.load(f)
+    pages={}
+    for url, m in manifest.items():
+        with open(os.path.join(path, m["file"]), "rb") as f:
+            pages[url]=(m["status"], m["content_type"], f.read())
+    return pages
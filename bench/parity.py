@@ -0,0 +1,367 @@
+# Paridad + velocidad de los backends de parseo sobre un corpus fijo (sin red).
+#   python -m bench.parity                       → corpus sintético + páginas "difíciles"
+#   python -m bench.parity --corpus .bench/corpus
+# 1) extracción: registro con BeautifulSoup(html.parser) (default) vs. lxml como builder (opt-in, ARTIFY_SOUP=lxml)
+# 2) crawl: outline (título/texto/links) de cada backend vs. lo que sacaba el crawl con bs4 + html.parser
+# 3) campos: scan_fields (una pasada) vs. extract_range/extract_deadline/extract_key_data/type_guess/guess_location
+#    sobre el texto del corpus + fragmentos armados al azar; cleanup_text vs. la versión anterior
+# 4) dedup: sobre el corpus (convocatorias todas distintas) igual que el dedup exacto por (fuente, título); con
+#    "reposts" armados al azar (otra fuente, título retocado, resumen recortado) mide cuántos junta el índice
+# 5) URLs: variantes de los links del corpus (http/https, www., barra final, ?utm_…, #ancla, puerto por defecto) dan
+#    la misma clave canónica; páginas distintas del corpus, claves distintas
+# 6) resultados: CallTable (columnar) vs. la lista de dicts — filas, CSV, ICS, dedup y búsquedas al azar contra un
+#    filtro lineal; fold() vs. la versión anterior
+# 7) store: el mismo refresh dos veces (corpus sintético por el proxy de replay, en otro proceso): la segunda pasada
+#    no puede dar "actualizadas" (dos URLs con la misma clave y el mismo score no se pisan entre corridas)
+# Las páginas TRICKY (HTML roto, <template>, links anidados) pueden diferir: html.parser no hace la recuperación de
+# errores de HTML5 que hacen lxml/lexbor. Se informan, pero la paridad exigida es sobre el resto del corpus.
+
+import io, os, re, csv, sys, time, random, argparse, tempfile, unicodedata, tracemalloc
+import multiprocessing as mp
+from datetime import timedelta
+
+import engine, parsers, neardup, canon, index
+from records import CallTable
+from bench import corpus
+from bench.server import ReplayServer
+
+TRICKY = {
+    "http://fixtures.local/malformed": "<html><head><title>Premio <b>Salón</title><body><p>Inscripción abierta<p>sin cierre"
+        "<a href='/a'>Bases<a href='/b'>Formulario</a><table><tr><td>cierra el 3 de mayo 2026</table></body>",
+    "http://fixtures.local/entities": "<!doctype html><title>Beca &amp; Residencia &#8211; 2026</title>"
+        "<p>Convocatoria&nbsp;abierta hasta el 10/11/2026. Premio US$ 5.000</p><a href=\"/x?a=1&amp;b=2\">Ver&nbsp;bases</a>",
+    "http://fixtures.local/script": "<html><head><title>Inicio</title><script>var t='convocatoria premio';</script>"
+        "<style>.beca{}</style></head><body><template><a href='/t'>tpl</a></template><p>Noticias del museo</p></body></html>",
+    "http://fixtures.local/nested": "<html><body><a href='/out'>Afuera <span>y <a href='/in'>adentro</a></span> fin</a>"
+        "<a href=''>vacío</a><a>sin href</a><A HREF='/MAYUS'>Mayúsculas</A><!-- <a href='/comentado'>x</a> --></body></html>",
+    "http://fixtures.local/latin1": "<html><head><meta charset='iso-8859-1'><title>Sal\xf3n Nacional</title></head>"
+        "<body><p>Inscripci\xf3n del 1 de marzo de 2026 al 30 de abril de 2026.</p></body></html>",
+}
+
+def pages_for(args):
+    pages=corpus.synthetic() if args.corpus=="synthetic" else corpus.load(args.corpus)
+    out=[]
+    for url, (status, ct, body) in pages.items():
+        if status==200 and "html" in ct: out.append((url, body, ct))
+    for url, html in TRICKY.items():
+        enc="latin-1" if "latin1" in url else "utf-8"
+        out.append((url, html.encode(enc), f"text/html; charset={enc}"))
+    return out
+
+def reference_outline(doc):
+    # lo que usaba el crawl antes: bs4 + html.parser
+    s=engine.BeautifulSoup(doc.html, "html.parser")
+    return parsers.Outline(s.title.get_text() if s.title else "", s.get_text(" "),
+                           [(a["href"], a.get_text(" ") or "") for a in s.select("a[href]")])
+
+def crawl_view(url, ol):
+    # lo que el crawl decide con un outline: ¿es hit? + links normalizados con su texto
+    text=engine.cleanup_text(ol.text)
+    hit=engine.seems_call(url, text) and not engine.GENERIC_BAD_TITLE.search(ol.title+" "+url)
+    links=[(engine.urljoin(url, h.strip()).split("#")[0], engine.cleanup_text(t).lower()) for h, t in ol.links
+           if h.strip() and not h.strip().startswith(("#", "mailto:"))]
+    return hit, links
+
+# fragmentos para armar textos al azar: fechas/montos/cupos válidos e inválidos, palabras de tipo/lugar, bordes
+FRAGMENTS = ["del 3 de marzo de 2026 al 5 de abril de 2026", "DEL 1/2/2026 AL 3/4/2026", "hasta el 10/11/2026", "hasta\n",
+    "Fecha límite: 12 de mayo 2026", "cierra el 3 de junio 2026", "12/13/2025", "31.12.2026", "99/99/2026", "US$ 5.000",
+    "USD1,000", "€ 300", "$ 20.000", "3 cupos", "10 ganadores", "Arancel de $ 1.500", "inscripción USD 20", "fee 30", "BECA",
+    "Salón", "salon", "Exposición", "exposicion", "residencia", "Buenos", "Aires", "caba", "CABA", "internacional", "sin costo",
+    "Gratuita", "gratis", "Premio", "concurso", "becaba", "İstanbul", "del", "hasta", "fecha", "1", "2026", " ", ".", ","]
+
+def fields_ref(title, desc, full):
+    # lo que hacía parse_doc antes: cada función recorre el texto por su cuenta
+    return (engine.extract_range(full), engine.extract_deadline(full), engine.type_guess(title+" "+desc+" "+full),
+            engine.guess_location(title+" "+full), engine.extract_key_data(full),
+            bool(re.search(r"(sin costo|sin cargo|gratuit[oa]|gratis)", full.lower())))
+
+def fields_scan(title, desc, full):
+    f=engine.scan_fields(full)
+    return (f.range, f.deadline, f.type_guess(title+" "+desc+" "), f.location(title+" "), (f.prize, f.slots, f.fee), f.free)
+
+def cleanup_ref(s):
+    # cleanup_text antes de juntar las pasadas
+    if not s: return ""
+    s=s.replace("\x00", " ")
+    s=re.sub(r"[\uFFFD]{2,}", " ", s)
+    s=re.sub(r"[^\x09\x0A\x0D\x20-\x7E\u00A0-\uFFFF]", " ", s)
+    return re.sub(r"\s{2,}", " ", s).strip()
+
+def field_cases(docs, n=3000, seed=1):
+    rnd=random.Random(seed); out=[]
+    for d in docs:
+        if d.soup: out.append((*engine.extract_title_desc(d.soup), d.text))
+    for _ in range(n):
+        full=rnd.choice(["", " ", " x "]).join(rnd.choice(FRAGMENTS) for _ in range(rnd.randint(0, 12)))
+        out.append((rnd.choice(["", "Premio", "Buenos"]), rnd.choice(["", "Aires x", "beca"]), full))
+    return out
+
+AGGREGATORS = ("catalogosparaartistas.com", "es.artealdia.com", "recursosculturales.com")
+
+def exact_dedup(records):
+    # el dedup de antes: (fuente, título normalizado), gana el mejor record_score
+    out={}
+    for r in records:
+        k=engine.record_key(r); cur=out.get(k)
+        if cur is None or engine.record_score(r)>engine.record_score(cur): out[k]=r
+    return list(out.values())
+
+def repost(rec, source, rnd):
+    # la misma convocatoria contada por un agregador
+    t=rec["title"]; v=rnd.random()
+    t=f"Convocatoria: {t}" if v<.3 else f"{t} | {source}" if v<.6 else t.upper() if v<.8 else f"{t} — abierta la inscripción"
+    sents=engine.sentences(rec["summary"]); rnd.shuffle(sents)
+    summary=" ".join(sents[:max(1, len(sents)-1)])+(" Más información en el sitio oficial." if rnd.random()<.5 else "")
+    return {**rec, "source": source, "title": t, "summary": summary, "url": f"https://{source}/nota/{rnd.randrange(10**6)}",
+            "deadline": rec["deadline"] if rnd.random()<.7 else None, "links": {**rec["links"], "inscripcion": None}}
+
+def csv_ref(items):
+    # export de la UI antes de la tabla columnar
+    buf=io.StringIO(); w=csv.writer(buf); w.writerow(engine.CSV_HEADER)
+    for c in items: w.writerow(engine.csv_row(c))
+    return buf.getvalue()
+
+def ics_ref(items):
+    ics=["BEGIN:VCALENDAR","VERSION:2.0","PRODID:-//Artify//Convocatorias//ES"]
+    for c in items:
+        if not c.get("deadline"): continue
+        desc=(c.get("summary","")[:200]).replace("\n"," ")
+        ics+=["BEGIN:VEVENT", f"SUMMARY:{c['title']} (cierre)", f"DTSTART;VALUE=DATE:{c['deadline'].strftime('%Y%m%d')}",
+              f"DTEND;VALUE=DATE:{(c['deadline']+timedelta(days=1)).strftime('%Y%m%d')}",
+              f"DESCRIPTION:{desc}  URL: {c.get('url','')}", "END:VEVENT"]
+    ics.append("END:VCALENDAR")
+    return "\n".join(ics)
+
+def fold_ref(s):
+    s=unicodedata.normalize("NFKD", s or "")
+    return "".join(c for c in s if not unicodedata.combining(c)).lower()
+
+def search_ref(recs, query="", types=None, location="Todas", only_free=False, desde=None, hasta=None, order="deadline"):
+    # filtro lineal con la semántica del índice: términos por prefijo, sin fecha no se descarta por rango
+    terms=index.tokens(query); out=[]
+    for i, r in enumerate(recs):
+        toks=index.tokens(f"{r['title']} {r['summary']} {r['source']}")
+        if not all(any(t.startswith(q) for t in toks) for q in terms): continue
+        if types is not None and r["type"] not in types: continue
+        if location!="Todas" and (r["scope"]=="AR")!=(location=="Argentina"): continue
+        if only_free and not r["free"]: continue
+        d=r["deadline"]
+        if d and ((desde and d<desde) or (hasta and d>hasta)): continue
+        out.append(i)
+    if order=="title": return sorted(out, key=lambda i: (recs[i]["title"], i))
+    return sorted(out, key=lambda i: (recs[i]["deadline"].toordinal() if recs[i]["deadline"] else index.NO_DEADLINE, i))
+
+def random_queries(recs, n, rnd):
+    words=sorted({w for r in recs for w in index.tokens(r["title"]) if len(w)>3})
+    days=sorted({r["deadline"] for r in recs if r["deadline"]})
+    for _ in range(n):
+        q=" ".join(rnd.choice(words)[:rnd.randint(3, 6)] for _ in range(rnd.choice((0, 0, 1, 2))))
+        types=rnd.choice((None, ["Becas", "Residencias", "Concursos", "Convocatorias"], ["Concursos"], []))
+        lo=rnd.choice((None, rnd.choice(days))); hi=rnd.choice((None, rnd.choice(days)))
+        yield dict(query=q, types=types, location=rnd.choice(("Todas", "Argentina", "Internacional")), only_free=rnd.random()<.3,
+                   desde=lo, hasta=hi, order=rnd.choice(("deadline", "title")))
+
+def grow(records, n):
+    # n resultados distintos a partir del corpus (otra edición: título, URL, resumen y fecha corridos)
+    out=[]
+    for i in range(n):
+        r=records[i%len(records)]; k=i//len(records)
+        out.append({**r, "title": f"{r['title']} {k}" if k else r["title"], "url": f"{r['url']}?v={k}",
+                    "summary": f"{r['summary']} ({k})" if k else r["summary"], "links": {**r["links"], "pdfs": list(r["links"]["pdfs"])},
+                    "deadline": r["deadline"] and r["deadline"]+timedelta(days=k)})
+    return out
+
+def refresh_twice(proxy, q):
+    # como un escenario del bench: proxy de replay, sin cachés en disco, store temporal
+    from bench.scenarios import _setup
+    eng, _=_setup(proxy, {})
+    import store
+    eng.CURATED_AR_SEEDS[:]=corpus.http_seeds(); eng.HOST_MIN_DELAY=0.0
+    st=store.CallStore(os.path.join(tempfile.mkdtemp(), "calls.sqlite"))
+    try: q.put([store.refresh(st, 60, extract_workers=0)[0] for _ in range(2)])
+    except BaseException as e: q.put(repr(e))
+
+def url_variant(url, rnd):
+    # la misma página escrita de otra forma (como llega de newsletters, redes y sitemaps)
+    p=engine.urlparse(url); scheme, host, path, query, frag=p.scheme, p.netloc, p.path, p.query, ""
+    for op in rnd.sample(range(6), rnd.randint(1, 3)):
+        if op==0: scheme="http" if scheme=="https" else "https"
+        elif op==1: host=host[4:] if host.lower().startswith("www.") else "www."+host
+        elif op==2: path=path.rstrip("/") if path.endswith("/") and path!="/" else path+"/"
+        elif op==3: query="&".join(x for x in (query, "utm_source=newsletter&utm_medium=email", "fbclid=IwAR0x") if x)
+        elif op==4: host=host.upper()+(":443" if scheme=="https" else ":80")
+        else: frag="#inscripcion"
+    return f"{scheme}://{host}{path}"+(f"?{query}" if query else "")+frag
+
+def timed(fn, n):
+    t=time.perf_counter()
+    for _ in range(n): fn()
+    return (time.perf_counter()-t)/n
+
+def main(argv=None):
+    ap=argparse.ArgumentParser(prog="python -m bench.parity")
+    ap.add_argument("--corpus", default="synthetic")
+    ap.add_argument("--repeat", type=int, default=3, help="repeticiones para medir tiempos")
+    args=ap.parse_args(argv)
+    pages=pages_for(args)
+    docs=[engine.Doc(u, b, ct, u) for u, b, ct in pages]
+    print(f"{len(docs)} páginas HTML · soup por defecto: {parsers.SOUP_FEATURES} · outline por defecto: {parsers.OUTLINE_BACKEND}")
+    ok=True
+
+    # 1) extracción: el default vs. lxml (ARTIFY_SOUP=lxml), si está instalado
+    default=parsers.SOUP_FEATURES; alt="lxml" if parsers._lxml_html else default; diffs=[]
+    for u, b, ct in pages:
+        recs=[]
+        for feat in ("html.parser", alt):
+            engine.SOUP_FEATURES=feat
+            recs.append(engine.extract_record(u, engine.Doc(u, b, ct, u)))
+        if recs[0]!=recs[1]: diffs.append((u, recs))
+    engine.SOUP_FEATURES=default
+    print(f"extracción html.parser vs {alt}: {len(pages)-len(diffs)}/{len(pages)} registros idénticos")
+    for u, (a, b) in diffs[:5]:
+        ok=ok and u in TRICKY
+        keys=[k for k in set(a or {})|set(b or {}) if (a or {}).get(k)!=(b or {}).get(k)]
+        print(f"  ≠ {u}: " + "; ".join(f"{k}: {(a or {}).get(k)!r} → {(b or {}).get(k)!r}" for k in keys))
+
+    # 2) crawl: outline de cada backend disponible vs. referencia
+    refs=[crawl_view(d.url, reference_outline(d)) for d in docs]
+    backends=[b for b in ("selectolax", "lxml", "stdlib") if b=="stdlib" or (parsers._Lexbor if b=="selectolax" else parsers._lxml_html)]
+    for be in backends:
+        bad=[d.url for d, ref in zip(docs, refs) if crawl_view(d.url, parsers.outline(d.html, be))!=ref]
+        ok=ok and all(u in TRICKY for u in bad)
+        print(f"crawl outline {be}: {len(docs)-len(bad)}/{len(docs)} páginas con mismo hit y mismos links"
+              + (f" (≠ {', '.join(bad[:3])})" if bad else ""))
+
+    # 3) campos + cleanup_text
+    cases=field_cases(docs)
+    bad=[full for t, ds, full in cases if fields_ref(t, ds, full)!=fields_scan(t, ds, full)]
+    ok=ok and not bad
+    print(f"campos scan_fields vs. funciones sueltas: {len(cases)-len(bad)}/{len(cases)} textos idénticos"
+          + (f" (≠ {bad[0][:80]!r})" if bad else ""))
+    rnd=random.Random(2); alpha=["a", "b", " ", "  ", "\n", "\t", "\r\n", "\x00", "\x01", "\x1c", "\x7f", "\uFFFD", "\uFFFD\uFFFD",
+                                "\u00A0", "\u2003", "\U0001F600"]
+    raws=["".join(rnd.choice(alpha) for _ in range(rnd.randint(0, 10))) for _ in range(20000)]
+    raws+=[d.soup.get_text(" ") for d in docs if d.soup]
+    bad=[r for r in raws if cleanup_ref(r)!=engine.cleanup_text(r)]
+    ok=ok and not bad
+    print(f"cleanup_text vs. versión anterior: {len(raws)-len(bad)}/{len(raws)} textos idénticos" + (f" (≠ {bad[0]!r})" if bad else ""))
+
+    # 4) dedup
+    records=[r for r in (engine.extract_record(d.url, d) for d in docs) if r]
+    exact=exact_dedup(records); near=engine.dedup_records(records)
+    ok=ok and near==exact
+    print(f"dedup: {len(records)} registros → exacto {len(exact)} · con casi-duplicados {len(near)}"
+          + (" (iguales)" if near==exact else " (≠: junta convocatorias distintas)"))
+    rnd=random.Random(3)
+    calls=[r for r in exact if "/convocatorias/" in r["url"]]
+    posts=[(r, repost(r, src, rnd)) for r in calls for src in rnd.sample(AGGREGATORS, 2)]
+    mixed=exact+[p for _, p in posts]; rnd.shuffle(mixed)
+    idx=engine.near_index(); cid={id(r): idx.add(r) for r in mixed}
+    found=sum(cid[id(o)]==cid[id(p)] for o, p in posts)
+    wrong=len(exact)-len({cid[id(r)] for r in exact})
+    print(f"  reposts de otra fuente: {found}/{len(posts)} juntados con el original · {wrong} convocatorias distintas juntadas"
+          + f" · {len(idx)} clusters (ideal {len(exact)})")
+    ok=ok and not wrong
+
+    # 5) URLs canónicas
+    links=sorted({engine.canonical(h, d.url) for d in docs for h, _ in d.outline.links} - {None})
+    rnd=random.Random(4); variants=[(u, url_variant(u, rnd)) for u in links for _ in range(3)]
+    before=len({u for u in links}|{v.split("#")[0] for _, v in variants})
+    after=len({canon.url_key(u) for u in links}|{canon.url_key(v) for _, v in variants})
+    missed=sum(canon.url_key(u)!=canon.url_key(v) for u, v in variants)
+    clash=len(pages)-len({canon.url_key(u) for u, _, _ in pages})
+    print(f"URLs: {len(links)} links + {len(variants)} variantes → antes {before} páginas a pedir, ahora {after}"
+          + f" · {missed} variantes sin juntar · {clash} páginas distintas con la misma clave")
+    ok=ok and not missed and not clash
+
+    # 6) tabla columnar de resultados
+    table=CallTable(records)
+    rows_ok=all(dict(c)==r and c.to_dict()==r for c, r in zip(table.rows(), records)) and len(table)==len(records)
+    ids=list(range(len(records))); rnd.shuffle(ids)
+    export_ok=table.to_csv(ids)==csv_ref([records[i] for i in ids]) and table.to_ics(ids)==ics_ref([records[i] for i in ids])
+    dedup_ok=[c.to_dict() for c in engine.dedup_records(table.rows())]==engine.dedup_records(records)
+    many=grow(records, 2000); cidx=index.CallIndex(many); rnd=random.Random(5)
+    queries=list(random_queries(many, 300, rnd))
+    bad=[q for q in queries if cidx.search(**q)!=search_ref(many, **q)]
+    texts=[f"{r['title']} {r['summary']}" for r in records]+["".join(rnd.choice("aáÁñÑüçǅﬁ²İ ̃x") for _ in range(20)) for _ in range(2000)]
+    fold_bad=[t for t in texts if index.fold(t)!=fold_ref(t)]
+    print(f"resultados en tabla: filas {'iguales' if rows_ok else 'DISTINTAS'} · CSV/ICS {'iguales' if export_ok else 'DISTINTOS'}"
+          + f" · dedup sobre filas {'igual' if dedup_ok else 'DISTINTO'} · {len(queries)-len(bad)}/{len(queries)} búsquedas iguales"
+          + f" al filtro lineal · fold {len(texts)-len(fold_bad)}/{len(texts)}" + (f" (≠ {bad[0]})" if bad else ""))
+    ok=ok and rows_ok and export_ok and dedup_ok and not bad and not fold_bad
+
+    # 7) store: dos refresh seguidos
+    srv=ReplayServer(corpus.synthetic()).start()
+    try:
+        ctx=mp.get_context("spawn"); q=ctx.Queue()
+        p=ctx.Process(target=refresh_twice, args=(srv.url, q)); p.start(); runs=q.get(); p.join()
+    finally: srv.stop()
+    if isinstance(runs, str): print(f"store: refresh falló ({runs})"); ok=False
+    else:
+        print("store, dos refresh iguales: " + " → ".join(f"{c['new']} nuevas / {c['updated']} actualizadas / {c['same']} sin cambios"
+                                                           for c in runs))
+        ok=ok and runs[1]["updated"]==0
+
+    # 8) tiempos por página
+    n=args.repeat
+    t_ref=timed(lambda: [reference_outline(d) for d in docs], n)/len(docs)
+    print(f"\ncrawl (título+texto+links) por página: bs4/html.parser {t_ref*1000:.2f} ms")
+    for be in backends:
+        t=timed(lambda: [parsers.outline(d.html, be) for d in docs], n)/len(docs)
+        print(f"  outline {be:<10} {t*1000:.2f} ms  ×{t_ref/t:.1f}")
+    def extract_all(feat):
+        engine.SOUP_FEATURES=feat
+        try: [engine.extract_record(u, engine.Doc(u, b, ct, u)) for u, b, ct in pages]
+        finally: engine.SOUP_FEATURES=default
+    texts=[d.text for d in docs]; raws=raws[20000:]
+    t_ref=timed(lambda: [fields_ref("", "", t) for t in texts], n)/len(docs)
+    t=timed(lambda: [fields_scan("", "", t) for t in texts], n)/len(docs)
+    print(f"campos por página: funciones sueltas {t_ref*1000:.3f} ms · scan_fields {t*1000:.3f} ms  ×{t_ref/t:.1f}")
+    t_ref=timed(lambda: [cleanup_ref(r) for r in raws], n)/len(raws)
+    t=timed(lambda: [engine.cleanup_text(r) for r in raws], n)/len(raws)
+    print(f"cleanup_text por página: antes {t_ref*1000:.3f} ms · ahora {t*1000:.3f} ms  ×{t_ref/t:.1f}")
+    for k in (1, 10):   # índice (≈ lineal) vs. comparar todos contra todos (cuadrático)
+        big=[{**r, "url": f"{r['url']}?v={i}", "title": f"{r['title']} {i}" if i else r["title"],
+              "deadline": r["deadline"] and r["deadline"]+timedelta(days=i)} for i in range(k) for r in mixed]
+        def pairwise():
+            sh=[neardup.shingles(r, idx.boiler) for r in big]
+            return sum(neardup.jaccard(a, b)>=.5 for i, a in enumerate(sh) for b in sh[:i])
+        t=timed(lambda: [engine.near_index().add(r) for r in big], 1)/len(big)
+        t_ref=timed(pairwise, 1)/len(big) if k==1 else None
+        print(f"casi-duplicados, {len(big)} registros: índice {t*1000:.3f} ms/registro"
+              + (f" · todos contra todos {t_ref*1000:.3f} ms/registro" if t_ref else ""))
+    urls=[f"{u}?id={i}" for i in range(100000//len(links)+1) for u in links][:100000]
+    seen=canon.SeenSet(urls); naive=set(urls)
+    t=timed(lambda: [u in seen for u in urls], 1)/len(urls)
+    mb=(sys.getsizeof(naive)+sum(sys.getsizeof(u) for u in urls))/2**20
+    print(f"ya-visto, {len(urls)} URLs: SeenSet {seen.nbytes/2**20:.1f} MB · set de strings {mb:.1f} MB"
+          + f" · {t*1e6:.1f} µs/consulta (con canon_key)")
+    many=grow(records, 5000)
+    def traced(build):
+        tracemalloc.start()
+        try: obj=build(); return obj, tracemalloc.get_traced_memory()[0]
+        finally: tracemalloc.stop()
+    packed=[engine.pack_record(r) for r in many]
+    plain, m_dicts=traced(lambda: [engine.unpack_record(t) for t in packed])
+    table, m_table=traced(lambda: CallTable(packed))
+    t_old=timed(lambda: index.CallIndex(plain), 1); t_new=timed(lambda: index.CallIndex(table), 1)
+    print(f"resultados, {len(many)} registros: dicts {m_dicts/2**20:.1f} MB · tabla {m_table/2**20:.1f} MB"
+          + f" · índice desde dicts {t_old*1000:.0f} ms, desde la tabla {t_new*1000:.0f} ms")
+    cidx=index.CallIndex(table); q=dict(types=["Becas", "Residencias", "Concursos", "Convocatorias"])
+    def rerun_dicts():
+        items=[plain[i] for i in cidx.search(**q)]; csv_ref(items); ics_ref(items); items[:20]
+    def rerun_table(memo=True):
+        if not memo: table._exports.clear()
+        ids=cidx.search(**q); table.to_csv(ids); table.to_ics(ids); cidx.rows(ids[:20])
+    t_ref=timed(rerun_dicts, n); t_cold=timed(lambda: rerun_table(False), n); t=timed(rerun_table, n)
+    print(f"  rerun (filtro + CSV + ICS + página): dicts {t_ref*1000:.1f} ms · tabla {t_cold*1000:.1f} ms"
+          + f" · mismo filtro (memo) {t*1000:.2f} ms")
+    t0=timed(lambda: extract_all("html.parser"), n)/len(pages)
+    print(f"extracción completa por página: html.parser {t0*1000:.2f} ms")
+    if alt!="html.parser":
+        t1=timed(lambda: extract_all(alt), n)/len(pages)
+        print(f"  {alt:<12} {t1*1000:.2f} ms  ×{t0/t1:.1f}")
+    return 0 if ok else 1
+
+if __name__=="__main__":
+    sys.exit(main())
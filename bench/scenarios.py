@@ -0,0 +1,91 @@
+# Escenarios del benchmark. Cada uno corre en un proceso aparte (pico de RSS propio, cachés y pools vacíos)
+# con el proxy de replay configurado y los cachés en disco apagados.
+
+import os, time, resource, multiprocessing as mp
+from concurrent.futures import ThreadPoolExecutor
+
+def percentile(xs, q:float):
+    if not xs: return 0.0
+    xs=sorted(xs)
+    return xs[min(len(xs)-1, max(0, int(round(q*len(xs)+0.5))-1))]
+
+def _setup(proxy:str, params:dict):
+    os.environ["ARTIFY_NO_CACHE"]="1"
+    os.environ["HTTP_PROXY"]=os.environ["HTTPS_PROXY"]=proxy
+    os.environ["NO_PROXY"]=""
+    import cache, engine
+    cache.CACHE_OFF=True   # por si cache ya se importó antes de setear el entorno
+    engine.set_fetch_engine(params.get("fetch") or "threads")
+    lat=[]
+    orig=engine._fetch_network
+    def timed(url, *a, **kw):
+        t=time.perf_counter()
+        try: return orig(url, *a, **kw)
+        finally: lat.append(time.perf_counter()-t)
+    engine._fetch_network=timed
+    async def atimed(url, *a, **kw):
+        t=time.perf_counter()
+        try: return await aorig(url, *a, **kw)
+        finally: lat.append(time.perf_counter()-t)
+    aorig=engine._afetch_network; engine._afetch_network=atimed
+    return engine, lat
+
+def _crawl(proxy:str, params:dict):
+    engine, lat=_setup(proxy, params)
+    from bench.corpus import http_seeds
+    per=params.get("per_site_limit", 12); found=0
+    for s in http_seeds():
+        found+=len(engine.crawl_site_for_calls(s, per_site_limit=per, follow_external=engine._is_aggregator(s), external_cap=per//2))
+    return {"pages": len(lat), "items": found, "latencies": lat}
+
+def _extract(proxy:str, params:dict):
+    engine, _=_setup(proxy, params)
+    from bench.corpus import synthetic, load
+    pages=load(params["corpus"]) if params.get("corpus") not in (None, "synthetic") else synthetic()
+    # como en Search: `workers` threads; la extracción en ellos o en el pool de procesos (extract_workers)
+    xw=params.get("extract_workers")
+    pool=engine.extract_pool(engine.EXTRACT_WORKERS if xw is None else xw)
+    if pool: pool.submit(int).result()   # que el arranque de los workers no cuente como extracción
+    def one(url, ct, body):
+        t=time.perf_counter()
+        rec=engine.parse_page(url, doc=engine.Doc(url, body, ct, url), pool=pool)
+        return time.perf_counter()-t, bool(rec)
+    with ThreadPoolExecutor(params.get("workers", 16)) as ex:
+        out=list(ex.map(lambda it: one(it[0], *it[1][1:]), [it for it in pages.items() if it[1][0]==200]))
+    return {"pages": len(out), "items": sum(ok for _, ok in out), "latencies": [t for t, _ in out]}
+
+def _e2e(proxy:str, params:dict):
+    engine, lat=_setup(proxy, params)
+    from bench.corpus import http_seeds
+    engine.CURATED_AR_SEEDS[:]=http_seeds()
+    search=engine.Search(params.get("intensity", 60), workers=params.get("workers", 16), extract_workers=params.get("extract_workers"))
+    recs=[rec for rec, _, _ in search if rec]
+    return {"pages": len(lat), "items": len(engine.dedup_records(recs)), "latencies": lat}
+
+SCENARIOS = {"crawl": _crawl, "extract": _extract, "e2e": _e2e}
+
+def _child(name:str, proxy:str, params:dict, q):
+    try:
+        t=time.perf_counter()
+        out=SCENARIOS[name](proxy, params)
+        out["wall"]=time.perf_counter()-t
+        out["peak_rss_mb"]=resource.getrusage(resource.RUSAGE_SELF).ru_maxrss/1024
+        q.put(out)
+    except BaseException as e:
+        q.put({"error": repr(e)})
+    finally:
+        import engine
+        engine.close_extract_pool()
+
+def run(name:str, server, params:dict):
+    server.reset()
+    ctx=mp.get_context("spawn"); q=ctx.Queue()
+    p=ctx.Process(target=_child, args=(name, server.url, params, q)); p.start()
+    out=q.get(); p.join()
+    if "error" in out: raise RuntimeError(f"{name}: {out['error']}")
+    c=server.counters(); lat=out.pop("latencies")
+    return {"scenario": name, "pages": out["pages"], "items": out["items"], "wall_s": round(out["wall"], 3),
+            "pages_per_s": round(out["pages"]/out["wall"], 1) if out["wall"] else 0.0,
+            "p50_ms": round(percentile(lat, .50)*1000, 1), "p95_ms": round(percentile(lat, .95)*1000, 1),
+            "bytes": c["bytes"], "requests": c["requests"], "errors": c["errors"],
+            "peak_rss_mb": round(out["peak_rss_mb"], 1)}
@@ -0,0 +1,75 @@
+# Server de replay: proxy HTTP local que sirve el corpus por URL absoluta (conserva los hosts reales,
+# así aplican los parsers por dominio y la lógica de agregadores) con latencia y errores inyectados.
+
+import time, random, threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlsplit, urlunsplit, unquote
+
+def _key(url:str):
+    # el corpus tiene paths con tildes ("/beca-de-creación"); el cliente los pide con %-encoding
+    p=urlsplit(url)
+    return urlunsplit(("http", p.netloc.lower(), unquote(p.path) or "/", p.query, ""))
+
+class ReplayServer:
+    def __init__(self, pages:dict, latency:float=0.0, jitter:float=0.0, error_rate:float=0.0,
+                 slow_hosts:dict=None, seed:int=7, port:int=0):
+        self.pages={_key(u): v for u, v in pages.items()}
+        self.latency=latency; self.jitter=jitter; self.error_rate=error_rate
+        self.slow_hosts=slow_hosts or {}   # host → multiplicador de latencia
+        self.rng=random.Random(seed); self._lock=threading.Lock()
+        self.requests=0; self.bytes_sent=0; self.errors=0; self.not_found=0
+        srv=self
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version="HTTP/1.1"
+            def log_message(self, *a): pass
+            def do_CONNECT(self):   # https real → afuera; el benchmark no sale a la red
+                self.send_response(403); self.send_header("Content-Length","0"); self.end_headers()
+                self.close_connection=True
+            def do_GET(self): srv._serve(self)
+        self.httpd=ThreadingHTTPServer(("127.0.0.1", port), Handler)
+        self.httpd.daemon_threads=True
+        self.port=self.httpd.server_address[1]
+        self.url=f"http://127.0.0.1:{self.port}"
+        self._thread=None
+
+    def _delay(self, host:str):
+        with self._lock:
+            d=self.latency+self.rng.uniform(-self.jitter, self.jitter)
+            fail=self.rng.random()<self.error_rate
+        return max(0.0, d*self.slow_hosts.get(host.replace("www.",""), 1.0)), fail
+
+    def _serve(self, h:BaseHTTPRequestHandler):
+        url=h.path if h.path.startswith("http") else f"http://{h.headers.get('Host','')}{h.path}"
+        key=_key(url); host=urlsplit(key).netloc
+        delay, fail=self._delay(host)
+        if delay: time.sleep(delay)
+        with self._lock: self.requests+=1
+        if fail:
+            with self._lock: self.errors+=1
+            if self.rng.random()<0.5:   # mitad 503, mitad conexión cortada
+                h.send_response(503); h.send_header("Content-Length","0"); h.end_headers(); return
+            h.close_connection=True; return
+        hit=self.pages.get(key)
+        if not hit:
+            with self._lock: self.not_found+=1
+            h.send_response(404); h.send_header("Content-Length","0"); h.end_headers(); return
+        status, ct, body=hit
+        if ct.startswith(("text/", "application/xml")): body=body.replace(b"https://", b"http://")
+        h.send_response(status)
+        h.send_header("Content-Type", ct); h.send_header("Content-Length", str(len(body)))
+        h.end_headers(); h.wfile.write(body)
+        with self._lock: self.bytes_sent+=len(body)
+
+    def start(self):
+        self._thread=threading.Thread(target=self.httpd.serve_forever, daemon=True); self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown(); self.httpd.server_close()
+
+    def counters(self):
+        with self._lock:
+            return {"requests": self.requests, "bytes": self.bytes_sent, "errors": self.errors, "not_found": self.not_found}
+
+    def reset(self):
+        with self._lock: self.requests=0; self.bytes_sent=0; self.errors=0; self.not_found=0
@@ -0,0 +1,263 @@
+# Artify — caché HTTP persistente (SQLite)
+# Guarda cuerpo + ETag/Last-Modified por URL normalizada; dentro del TTL responde sin red, después
+# revalida con If-None-Match/If-Modified-Since (un 304 no trae cuerpo). LRU acotado por bytes.
+# Los 404/410 de URLs adivinadas (robots, sitemaps, feeds, wp-json) quedan anotados por MISSING_TTL.
+# Además, caché de registros extraídos y de texto de PDFs por hash de contenido (ExtractCache, PdfTextCache).
+
+import os, json, time, sqlite3, hashlib, inspect, threading
+from datetime import date
+from urllib.parse import urlsplit, urlunsplit
+
+CACHE_DIR = os.environ.get("ARTIFY_CACHE_DIR") or os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache")
+CACHE_OFF = bool(os.environ.get("ARTIFY_NO_CACHE"))   # benchmarks / debugging: todo va a la red y al extractor
+HTTP_CACHE_MAX_BYTES = 256*1024*1024
+HTTP_CACHE_MAX_ITEM = 4*1024*1024
+DEFAULT_TTL = 6*3600
+MISSING_TTL = 3*24*3600   # un sitemap/feed que no existía: no se vuelve a probar por unos días
+MISSING_STATUS = (404, 410)
+HOST_TTL = {   # overrides por host (sin www.): agregadores cambian seguido, museos casi nunca
+    "catalogosparaartistas.com": 2*3600,
+    "artealdia.com": 2*3600,
+    "recursosculturales.com": 2*3600,
+    "museosiivori.buenosaires.gob.ar": 24*3600,
+    "museorosagalisteo.gob.ar": 24*3600,
+}
+
+def cache_key(url:str):
+    p=urlsplit(url.strip())
+    host=(p.hostname or "").lower()
+    if p.port and not ((p.scheme=="http" and p.port==80) or (p.scheme=="https" and p.port==443)):
+        host=f"{host}:{p.port}"
+    return urlunsplit((p.scheme.lower(), host, p.path or "/", p.query, ""))
+
+def host_ttl(url:str):
+    host=(urlsplit(url).hostname or "").lower().replace("www.","")
+    return HOST_TTL.get(host, DEFAULT_TTL)
+
+class CachedResponse:
+    __slots__=("url","final","ct","etag","last_modified","body","fetched")
+    def __init__(self, url, final, ct, etag, last_modified, body, fetched):
+        self.url=url; self.final=final; self.ct=ct; self.etag=etag
+        self.last_modified=last_modified; self.body=body; self.fetched=fetched
+
+    @property
+    def fresh(self):
+        return time.time()-self.fetched < host_ttl(self.url)
+
+    def valid(self, since:float=None):
+        # fresca y, si hay since (actualización forzada), bajada o revalidada después: si no, GET condicional
+        return self.fresh and (since is None or self.fetched>=since)
+
+    def conditional_headers(self):
+        h={}
+        if self.etag: h["If-None-Match"]=self.etag
+        if self.last_modified: h["If-Modified-Since"]=self.last_modified
+        return h
+
+class HttpCache:
+    def __init__(self, path:str=None, max_bytes:int=HTTP_CACHE_MAX_BYTES, max_item:int=HTTP_CACHE_MAX_ITEM):
+        if path is None:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            path=os.path.join(CACHE_DIR, "http.sqlite")
+        self.path=path; self.max_bytes=max_bytes; self.max_item=max_item
+        self.hits=0; self.revalidated=0; self.misses=0
+        self._lock=threading.Lock()
+        self._db=sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=10)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("""CREATE TABLE IF NOT EXISTS responses(
+            url TEXT PRIMARY KEY, final TEXT, ct TEXT, etag TEXT, last_modified TEXT,
+            body BLOB, size INTEGER, fetched REAL, accessed REAL)""")
+        self._db.execute("CREATE TABLE IF NOT EXISTS missing(url TEXT PRIMARY KEY, status INTEGER, checked REAL)")
+        self._db.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses(accessed)")
+        self._size=self._db.execute("SELECT COALESCE(SUM(size),0) FROM responses").fetchone()[0]
+
+    def get(self, url:str, since:float=None):
+        key=cache_key(url)
+        with self._lock:
+            row=self._db.execute("SELECT final, ct, etag, last_modified, body, fetched FROM responses WHERE url=?", (key,)).fetchone()
+            if not row:
+                self.misses+=1; return None
+            self._db.execute("UPDATE responses SET accessed=? WHERE url=?", (time.time(), key))
+            ent=CachedResponse(key, row[0], row[1], row[2], row[3], row[4], row[5])
+            if ent.valid(since): self.hits+=1
+        return ent
+
+    def put(self, url:str, final:str, ct:str, body:bytes, etag:str=None, last_modified:str=None):
+        if len(body) > self.max_item: return
+        key=cache_key(url); now=time.time()
+        with self._lock:
+            old=self._db.execute("SELECT size FROM responses WHERE url=?", (key,)).fetchone()
+            self._db.execute("INSERT OR REPLACE INTO responses VALUES (?,?,?,?,?,?,?,?,?)",
+                             (key, final, ct, etag, last_modified, body, len(body), now, now))
+            self._size+=len(body)-(old[0] if old else 0)
+            if self._size > self.max_bytes: self._evict()
+
+    def touch(self, url:str, etag:str=None, last_modified:str=None):
+        # 304: el cuerpo guardado sigue valiendo, arranca otro TTL
+        key=cache_key(url); now=time.time()
+        with self._lock:
+            self._db.execute("UPDATE responses SET fetched=?, accessed=?, etag=COALESCE(?,etag), last_modified=COALESCE(?,last_modified) WHERE url=?",
+                             (now, now, etag, last_modified, key))
+            self.revalidated+=1
+
+    def _evict(self):
+        # LRU: borra por último acceso hasta quedar en 90% del máximo
+        target=int(self.max_bytes*0.9)
+        rows=self._db.execute("SELECT url, size FROM responses ORDER BY accessed").fetchall()
+        drop=[]
+        for url, size in rows:
+            if self._size<=target: break
+            drop.append((url,)); self._size-=size
+        self._db.executemany("DELETE FROM responses WHERE url=?", drop)
+
+    # ───────── respuestas negativas (404/410)
+    def is_missing(self, url:str):
+        with self._lock:
+            row=self._db.execute("SELECT checked FROM missing WHERE url=?", (cache_key(url),)).fetchone()
+        return bool(row and time.time()-row[0]<MISSING_TTL)
+
+    def put_missing(self, url:str, status:int):
+        now=time.time()
+        with self._lock:
+            self._db.execute("INSERT OR REPLACE INTO missing VALUES (?,?,?)", (cache_key(url), status, now))
+            self._db.execute("DELETE FROM missing WHERE checked<?", (now-MISSING_TTL,))
+
+    def stats(self):
+        with self._lock:
+            n=self._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        return {"entries": n, "bytes": self._size, "hits": self.hits, "revalidated": self.revalidated, "misses": self.misses}
+
+_http_cache=None
+_http_cache_lock=threading.Lock()
+
+def http_cache():
+    # singleton perezoso; None si el disco no es escribible (la app sigue sin caché)
+    global _http_cache
+    with _http_cache_lock:
+        if _http_cache is None:
+            if CACHE_OFF: _http_cache=False
+            else:
+                try: _http_cache=HttpCache()
+                except (OSError, sqlite3.Error): _http_cache=False
+    return _http_cache or None
+
+# ───────── Caché de extracción: registro ya extraído por hash del cuerpo + versión del extractor
+EXTRACT_CACHE_MAX_ENTRIES = 20000
+_DATE_FIELDS = ("open_at", "deadline")
+
+def content_key(data:bytes, *parts):
+    h=hashlib.sha256(data)
+    for p in parts: h.update(b"\0"+str(p).encode("utf-8"))
+    return h.hexdigest()
+
+def code_version(*objs):
+    # cambia solo si cambia el código fuente de las funciones/constantes que se le pasan
+    h=hashlib.sha256()
+    for o in objs:
+        try: src=inspect.getsource(o)
+        except (TypeError, OSError): src=repr(o)
+        h.update(src.encode("utf-8"))
+    return h.hexdigest()[:16]
+
+def record_to_json(rec):
+    if rec is None: return "null"
+    out=dict(rec)
+    for k in _DATE_FIELDS:
+        if out.get(k): out[k]=out[k].isoformat()
+    return json.dumps(out, ensure_ascii=False)
+
+def record_from_json(txt:str):
+    rec=json.loads(txt)
+    if rec is None: return None
+    for k in _DATE_FIELDS:
+        if rec.get(k): rec[k]=date.fromisoformat(rec[k])
+    return rec
+
+class ExtractCache:
+    def __init__(self, path:str=None, max_entries:int=EXTRACT_CACHE_MAX_ENTRIES):
+        if path is None:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            path=os.path.join(CACHE_DIR, "extract.sqlite")
+        self.path=path; self.max_entries=max_entries
+        self.hits=0; self.misses=0; self._puts=0
+        self._lock=threading.Lock()
+        self._db=sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=10)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("CREATE TABLE IF NOT EXISTS extractions(key TEXT PRIMARY KEY, record TEXT, accessed REAL)")
+        self._db.execute("CREATE INDEX IF NOT EXISTS extractions_accessed ON extractions(accessed)")
+
+    def get(self, key:str):
+        # (True, registro|None) si ya se extrajo; (False, None) si hay que parsear
+        with self._lock:
+            row=self._db.execute("SELECT record FROM extractions WHERE key=?", (key,)).fetchone()
+            if not row:
+                self.misses+=1; return False, None
+            self._db.execute("UPDATE extractions SET accessed=? WHERE key=?", (time.time(), key))
+            self.hits+=1
+        return True, record_from_json(row[0])
+
+    def put(self, key:str, rec):
+        with self._lock:
+            self._db.execute("INSERT OR REPLACE INTO extractions VALUES (?,?,?)", (key, record_to_json(rec), time.time()))
+            self._puts+=1
+            if self._puts % 500 == 0:
+                self._db.execute("""DELETE FROM extractions WHERE key IN (
+                    SELECT key FROM extractions ORDER BY accessed DESC LIMIT -1 OFFSET ?)""", (self.max_entries,))
+
+_extract_cache=None
+
+def extract_cache():
+    global _extract_cache
+    with _http_cache_lock:
+        if _extract_cache is None:
+            if CACHE_OFF: _extract_cache=False
+            else:
+                try: _extract_cache=ExtractCache()
+                except (OSError, sqlite3.Error): _extract_cache=False
+    return _extract_cache or None
+
+# ───────── Texto de PDFs por hash del cuerpo: el mismo PDF de bases suele estar linkeado desde varias páginas
+PDF_CACHE_MAX_ENTRIES = 5000
+
+class PdfTextCache:
+    def __init__(self, path:str=None, max_entries:int=PDF_CACHE_MAX_ENTRIES):
+        if path is None:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            path=os.path.join(CACHE_DIR, "extract.sqlite")
+        self.path=path; self.max_entries=max_entries
+        self.hits=0; self.misses=0; self._puts=0
+        self._lock=threading.Lock()
+        self._db=sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=10)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("CREATE TABLE IF NOT EXISTS pdf_text(key TEXT PRIMARY KEY, title TEXT, text TEXT, accessed REAL)")
+        self._db.execute("CREATE INDEX IF NOT EXISTS pdf_text_accessed ON pdf_text(accessed)")
+
+    def get(self, key:str):
+        # (título, texto) o None si no se leyó todavía
+        with self._lock:
+            row=self._db.execute("SELECT title, text FROM pdf_text WHERE key=?", (key,)).fetchone()
+            if not row:
+                self.misses+=1; return None
+            self._db.execute("UPDATE pdf_text SET accessed=? WHERE key=?", (time.time(), key))
+            self.hits+=1
+        return row
+
+    def put(self, key:str, title:str, text:str):
+        with self._lock:
+            self._db.execute("INSERT OR REPLACE INTO pdf_text VALUES (?,?,?,?)", (key, title, text, time.time()))
+            self._puts+=1
+            if self._puts % 200 == 0:
+                self._db.execute("""DELETE FROM pdf_text WHERE key IN (
+                    SELECT key FROM pdf_text ORDER BY accessed DESC LIMIT -1 OFFSET ?)""", (self.max_entries,))
+
+_pdf_cache=None
+
+def pdf_cache():
+    global _pdf_cache
+    with _http_cache_lock:
+        if _pdf_cache is None:
+            if CACHE_OFF: _pdf_cache=False
+            else:
+                try: _pdf_cache=PdfTextCache()
+                except (OSError, sqlite3.Error): _pdf_cache=False
+    return _pdf_cache or None
@@ -0,0 +1,186 @@
+# Artify — URLs canónicas y "ya visto" compartido por crawl, parse y dedup
+# La misma página llega como http/https, con y sin www., con barra final o sin, con ?utm_source=… del newsletter o
+# #ancla. canonical(url) da la forma que se pide (esquema y host en minúscula, sin puerto por defecto, sin fragmento
+# ni parámetros de tracking); url_key(url) la identidad de la página (además sin esquema, sin www., sin barra final y
+# con la query ordenada). Lo que las páginas declaran (<link rel=canonical>, og:url) y los redirects quedan como
+# alias en ALIASES (se guardan entre corridas): canon_key(url) ya los aplica. SeenSet guarda un hash de 8 bytes por URL.
+
+import os, re, time, sqlite3, hashlib, threading
+from array import array
+from urllib.parse import urlsplit, urlunsplit, urljoin
+
+from cache import CACHE_DIR, CACHE_OFF
+
+ALIASES_PATH = os.path.join(CACHE_DIR, "canon.sqlite")
+TRACKING_PARAMS = frozenset(("fbclid", "gclid", "dclid", "gbraid", "wbraid", "msclkid", "yclid", "igshid", "mc_cid",
+                             "mc_eid", "_ga", "_gl", "_hsenc", "_hsmi", "mkt_tok", "ref_src", "s_cid", "srsltid"))
+TRACKING_PREFIXES = ("utm_", "pk_", "mtm_")
+MAX_ALIASES = 200000      # los más nuevos; más que esto no se carga
+FORGET_AFTER = 30*24*3600 # alias más viejo que esto no se carga (los sitios se rearman)
+HEAD_SCAN = 64*1024       # sin </head> se busca en este prefijo del HTML
+
+_DEFAULT_PORT = {"http": 80, "https": 443}
+_HEAD_TAG = re.compile(r"<(?:link|meta)\b[^>]*>", re.I)
+_ATTR = re.compile(r"""([\w:-]+)\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s"'>]+))""")
+
+def _tracking(name:str):
+    n=name.lower()
+    return n in TRACKING_PARAMS or n.startswith(TRACKING_PREFIXES)
+
+def _query(q:str, sort:bool=False):
+    # sin los parámetros de tracking; el resto tal cual vino (mismo encoding), ordenado si es para la clave
+    parts=[s for s in q.split("&") if s and not _tracking(s.split("=", 1)[0])] if q else []
+    return "&".join(sorted(parts) if sort else parts)
+
+def canonical(url:str, base:str=None):
+    # forma para pedir y guardar; None si no es http(s) (mailto:, javascript:, tel:…) o no tiene host
+    if not url: return None
+    url=url.strip()
+    if base: url=urljoin(base, url)
+    try:
+        p=urlsplit(url); port=p.port
+    except ValueError: return None
+    scheme=p.scheme.lower()
+    if scheme not in _DEFAULT_PORT or not p.hostname: return None
+    host=p.hostname.lower().rstrip(".")
+    if port and port!=_DEFAULT_PORT[scheme]: host=f"{host}:{port}"
+    return urlunsplit((scheme, host, p.path or "/", _query(p.query), ""))
+
+def site_host(url:str):
+    # "el mismo sitio": host en minúscula, sin www. ni puerto por defecto
+    try: p=urlsplit((url or "").strip()); port=p.port
+    except ValueError: return ""
+    h=(p.hostname or "").lower().rstrip(".")
+    if h.startswith("www."): h=h[4:]
+    return f"{h}:{port}" if port and port not in (80, 443) else h
+
+def url_key(url:str):
+    # identidad de la página: http/https, www., puerto por defecto, barra final, tracking y orden de la query no
+    # la cambian. Sin aliases (ver canon_key).
+    try: p=urlsplit((url or "").strip())
+    except ValueError: return (url or "").strip()
+    q=_query(p.query, sort=True)
+    return f"{site_host(url)}{p.path.rstrip('/') or '/'}" + (f"?{q}" if q else "")
+
+def head_canonical(html:str, base:str):
+    # <link rel="canonical"> (o si no, <meta property="og:url">) del <head>, absoluta; None si no declara
+    end=(html or "").find("</head>")
+    head=html[:end if end>=0 else HEAD_SCAN] if html else ""
+    link=og=None
+    for tag in _HEAD_TAG.findall(head):
+        a={m.group(1).lower(): next(g for g in m.groups()[1:] if g is not None) for m in _ATTR.finditer(tag)}
+        if tag[1:5].lower()=="link":
+            if "canonical" in (a.get("rel") or "").lower().split() and a.get("href"): link=link or a["href"]
+        elif (a.get("property") or a.get("name") or "").lower()=="og:url" and a.get("content"): og=og or a["content"]
+    return canonical(link or og, base) if (link or og) else None
+
+class Aliases:
+    # url_key → url_key de la página que la URL realmente es (declarada o destino del redirect). Sólo dentro del
+    # mismo sitio, y una página interna que declara la home no cuenta (plantillas de CMS mal configuradas).
+    def __init__(self, path:str=None):
+        self.path=path; self.map={}; self._new={}; self._lock=threading.Lock()
+        self.learned=0
+        if path: self._load()
+
+    def resolve(self, key:str):
+        for _ in range(3):   # cadenas cortas (a → b aprendido antes de b → c)
+            nxt=self.map.get(key)
+            if nxt is None or nxt==key: break
+            key=nxt
+        return key
+
+    def learn(self, url:str, target:str):
+        if not url or not target: return False
+        a=url_key(url); b=self.resolve(url_key(target))
+        host=b.split("/", 1)[0]
+        if a==b or a.split("/", 1)[0]!=host: return False
+        if b.partition("?")[0]==host+"/" and a.partition("?")[0]!=host+"/": return False
+        if self.map.get(a)==b: return False
+        with self._lock:
+            self.map[a]=b; self._new[a]=(b, time.time()); self.learned+=1
+        return True
+
+    def __len__(self): return len(self.map)
+
+    # ───────── persistencia (lo aprendido en una corrida evita fetches en la siguiente)
+    def _db(self):
+        d=os.path.dirname(self.path)
+        if d: os.makedirs(d, exist_ok=True)
+        db=sqlite3.connect(self.path, isolation_level=None, timeout=5)
+        db.execute("CREATE TABLE IF NOT EXISTS aliases(key TEXT PRIMARY KEY, target TEXT, updated REAL)")
+        return db
+
+    def _load(self):
+        try:
+            db=self._db()
+            try: rows=db.execute("SELECT key, target FROM aliases WHERE updated>? ORDER BY updated DESC LIMIT ?",
+                                 (time.time()-FORGET_AFTER, MAX_ALIASES)).fetchall()
+            finally: db.close()
+        except (OSError, sqlite3.Error):
+            self.path=None; return
+        self.map.update(rows)
+
+    def save(self):
+        if not self.path: return
+        with self._lock:
+            rows=[(k, b, t) for k, (b, t) in self._new.items()]; self._new={}
+        if not rows: return
+        try:
+            db=self._db()
+            try: db.executemany("INSERT OR REPLACE INTO aliases VALUES (?,?,?)", rows)
+            finally: db.close()
+        except (OSError, sqlite3.Error):
+            pass
+
+ALIASES = Aliases(None if CACHE_OFF else ALIASES_PATH)
+
+def canon_key(url:str):
+    return ALIASES.resolve(url_key(url))
+
+class SeenSet:
+    # set de URLs por canon_key, guardando sólo un hash de 64 bits en una tabla abierta (array de uint64, sondeo
+    # lineal, ocupación ≤ 1/2): ~16 bytes por URL contra ~150 de un set de strings. Colisión (dos páginas, mismo
+    # hash) ≈ n²/2⁶⁵: despreciable. add() es chequear + agregar atómico.
+    __slots__=("_t","_mask","n","_lock")
+    def __init__(self, urls=(), cap:int=1024):
+        size=1<<max(4, (2*cap-1).bit_length())
+        self._t=array("Q", bytes(8*size)); self._mask=size-1; self.n=0; self._lock=threading.Lock()
+        for u in urls: self.add(u)
+
+    @staticmethod
+    def _hash(url:str):
+        h=int.from_bytes(hashlib.blake2b(canon_key(url).encode("utf-8", "surrogatepass"), digest_size=8).digest(), "little")
+        return h or 1   # 0 = slot vacío
+
+    def _slot(self, h:int):
+        t=self._t; m=self._mask; i=h&m
+        while t[i] and t[i]!=h: i=(i+1)&m
+        return i
+
+    def _grow(self):
+        old=self._t; size=2*len(old)
+        self._t=array("Q", bytes(8*size)); self._mask=size-1
+        for h in old:
+            if h: self._t[self._slot(h)]=h
+
+    def add(self, url:str):
+        # True si no estaba
+        h=self._hash(url)
+        with self._lock:
+            i=self._slot(h)
+            if self._t[i]: return False
+            self._t[i]=h; self.n+=1
+            if 2*self.n>len(self._t): self._grow()
+            return True
+
+    def update(self, urls):
+        for u in urls: self.add(u)
+
+    def __contains__(self, url:str):
+        h=self._hash(url)
+        with self._lock: return bool(self._t[self._slot(h)])
+
+    def __len__(self): return self.n
+
+    @property
+    def nbytes(self): return self._t.itemsize*len(self._t)
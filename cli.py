@@ -0,0 +1,96 @@
+# ✨ Artify — línea de comandos (sin Streamlit)
+#   python cli.py refresh                 → una pasada: rastrea las semillas y actualiza el store
+#   python cli.py refresh --every 3600    → queda corriendo y refresca cada hora
+#   python cli.py batch -o out.jsonl      → crawl + extracción, un registro por línea apenas sale
+#   python cli.py batch --metrics m.json  → además, tiempos por etapa/host y gauges de la corrida
+#   python cli.py --fetch asyncio batch   → descargas por el event loop (aiohttp) en vez de un thread por request
+
+import sys, csv, json, time, argparse
+
+from cache import record_to_json
+from engine import Search, set_fetch_engine, CSV_HEADER, csv_row
+from store import CallStore, STORE_PATH, refresh
+
+def dump_metrics(path:str, search):
+    if not path: return
+    out=sys.stderr if path=="-" else open(path, "w", encoding="utf-8")
+    try: json.dump(search.diagnostics(), out, indent=1, ensure_ascii=False); out.write("\n")
+    finally:
+        if out is not sys.stderr: out.close()
+
+def cmd_refresh(args):
+    store=CallStore(args.store)
+    while True:
+        t0=time.time()
+        counts, search = refresh(store, args.intensity, time_limit=args.time_limit, workers=args.workers,
+                                 extract_workers=args.extract_workers)
+        print(f"[{time.strftime('%Y-%m-%d %H:%M:%S')}] {counts['new']} nuevas · {counts['updated']} actualizadas · "
+              f"{counts['same']} sin cambios · {counts['pruned']} borradas · {store.count()} en el store · "
+              f"{round(time.time()-t0,1)} s" + (" · ⌛ corte por tiempo" if search.timed_out else ""), flush=True)
+        dump_metrics(args.metrics, search)   # con --every se pisa en cada pasada
+        if not args.every: return 0
+        time.sleep(max(0.0, args.every-(time.time()-t0)))
+
+def cmd_batch(args):
+    # cada registro se escribe (y se descarta) apenas termina su parse. Con --no-dedup la memoria es constante; con
+    # dedup el índice de casi-duplicados (firma, URLs y mejor registro) crece con cada registro que sale
+    out=sys.stdout if args.out=="-" else open(args.out, "w", encoding="utf-8", newline="")
+    try:
+        w=None
+        if args.format=="csv":
+            w=csv.writer(out); w.writerow(CSV_HEADER)
+        t0=time.time(); n=0; seen=set()
+        search=Search(args.intensity, workers=args.workers, extract_workers=args.extract_workers,
+                      deadline=time.monotonic()+args.time_limit if args.time_limit else None, dedup=not args.no_dedup)
+        for rec, done, total in search:
+            if not rec: continue
+            if not args.no_dedup:
+                key=search.near.cluster(rec)   # misma fuente y título o la misma convocatoria en otra fuente
+                if key in seen: continue   # streaming: gana la primera versión, no la de mejor score
+                seen.add(key)
+            if w: w.writerow(csv_row(rec))
+            else: out.write(record_to_json(rec)+"\n")
+            out.flush(); n+=1
+        print(f"{n} registros · {search.done} páginas parseadas · {round(time.time()-t0,1)} s"
+              + (f" · ⌛ corte: {search.skipped} sin empezar, {search.cut_off} cortadas" if search.timed_out else ""),
+              file=sys.stderr)
+        dump_metrics(args.metrics, search)
+    finally:
+        if out is not sys.stdout: out.close()
+    return 0
+
+def main(argv=None):
+    ap=argparse.ArgumentParser(prog="artify", description="Artify sin UI: crawl + extracción de convocatorias.")
+    ap.add_argument("--fetch", choices=("threads", "asyncio"), help="motor de descargas (asyncio necesita aiohttp)")
+    sub=ap.add_subparsers(dest="cmd", required=True)
+
+    r=sub.add_parser("refresh", help="rastrea las semillas curadas y hace upsert en el store de convocatorias")
+    r.add_argument("--every", type=float, default=0, help="segundos entre pasadas (0 = una sola pasada)")
+    r.add_argument("--intensity", type=int, default=96, help="páginas aprox. (como el slider de la UI)")
+    r.add_argument("--time-limit", type=float, default=None, help="corte duro por pasada, en segundos")
+    r.add_argument("--workers", type=int, default=16, help="descargas simultáneas")
+    r.add_argument("--extract-workers", type=int, default=None, help="procesos de extracción (0 = en los threads de descarga)")
+    r.add_argument("--store", default=STORE_PATH)
+    r.add_argument("--metrics", help="JSON con tiempos por etapa/host de la pasada ('-' = stderr)")
+    r.set_defaults(func=cmd_refresh)
+
+    b=sub.add_parser("batch", help="crawl + extracción sin UI, escribe JSONL/CSV a medida que salen los registros")
+    b.add_argument("-o", "--out", default="-", help="archivo de salida ('-' = stdout)")
+    b.add_argument("--format", choices=("jsonl", "csv"), default="jsonl")
+    b.add_argument("--intensity", type=int, default=60, help="páginas aprox. (como el slider de la UI)")
+    b.add_argument("--time-limit", type=float, default=None, help="corte duro en segundos")
+    b.add_argument("--workers", type=int, default=16, help="descargas simultáneas")
+    b.add_argument("--extract-workers", type=int, default=None, help="procesos de extracción (0 = en los threads de descarga)")
+    b.add_argument("--no-dedup", action="store_true", help="no filtrar repetidos (misma fuente y título, o casi-duplicados entre fuentes); "
+                   "sin esto la memoria crece con la cantidad de registros")
+    b.add_argument("--metrics", help="JSON con tiempos por etapa/host de la corrida ('-' = stderr)")
+    b.set_defaults(func=cmd_batch)
+
+    args=ap.parse_args(argv)
+    if args.fetch:
+        try: set_fetch_engine(args.fetch)
+        except RuntimeError as e: ap.error(str(e))
+    return args.func(args)
+
+if __name__=="__main__":
+    sys.exit(main())
@@ -0,0 +1,148 @@
+# Artify — descubrimiento de URLs sin BFS: robots.txt → sitemaps (e índices), feeds RSS/Atom y la API de WordPress
+# Devuelve entradas crudas (url, lastmod, título); el motor decide cuáles parecen convocatoria y en qué orden.
+# El fetch lo pone el que llama (fetch(url) → bytes), así no depende del motor.
+
+import re, json, gzip
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse, urljoin
+import xml.etree.ElementTree as ET
+
+from canon import canonical, url_key, site_host
+
+SITEMAP_PATHS = ("/sitemap.xml", "/sitemap_index.xml", "/wp-sitemap.xml")   # si robots.txt no declara ninguno
+MAX_SITEMAPS = 6          # sitemaps leídos por seed (índices incluidos)
+MAX_ENTRIES = 5000        # URLs por seed
+WP_POSTS = "/wp-json/wp/v2/posts?per_page=50&_fields=link,modified,title"
+FEED_TYPES = ("application/rss+xml", "application/atom+xml")
+
+_LINK_TAG = re.compile(r"<link\b[^>]*>", re.I)
+_ATTR = re.compile(r"""([\w-]+)\s*=\s*(?:"([^"]*)"|'([^']*)')""")
+
+class Entry:
+    __slots__=("url","lastmod","title","via")
+    def __init__(self, url:str, lastmod:datetime=None, title:str="", via:str=""):
+        self.url=url; self.lastmod=lastmod; self.title=title; self.via=via
+    def __repr__(self): return f"Entry({self.url!r}, {self.lastmod}, via={self.via})"
+
+def _tag(el):
+    return el.tag.rsplit("}", 1)[-1].lower()
+
+def parse_date(s:str):
+    # ISO 8601 (sitemaps, Atom, WP) o RFC 822 (RSS) → datetime naive en UTC
+    s=(s or "").strip()
+    if not s: return None
+    try: d=datetime.fromisoformat(s.replace("Z", "+00:00"))
+    except ValueError:
+        try: d=parsedate_to_datetime(s)
+        except (TypeError, ValueError): return None
+    return d.astimezone(timezone.utc).replace(tzinfo=None) if d.tzinfo else d
+
+def robots_sitemaps(data:bytes):
+    out=[]
+    for line in data.decode("utf-8", "replace").splitlines():
+        k, _, v=line.partition(":")
+        if k.strip().lower()=="sitemap" and v.strip(): out.append(v.strip())
+    return out
+
+def _xml(data:bytes):
+    if data[:2]==b"\x1f\x8b":
+        try: data=gzip.decompress(data)
+        except OSError: return None
+    try: return ET.fromstring(data)
+    except ET.ParseError: return None
+
+def parse_sitemap(data:bytes):
+    # → ("index" | "urlset" | None, [(loc, lastmod)])
+    root=_xml(data)
+    if root is None or _tag(root) not in ("sitemapindex", "urlset"): return None, []
+    items=[]
+    for el in root:
+        loc=lastmod=None
+        for c in el:
+            t=_tag(c)
+            if t=="loc": loc=(c.text or "").strip()
+            elif t=="lastmod": lastmod=parse_date(c.text)
+        if loc: items.append((loc, lastmod))
+    return ("index" if _tag(root)=="sitemapindex" else "urlset"), items
+
+def parse_feed(data:bytes):
+    # RSS 2.0 (<item>) o Atom (<entry>) → [(link, fecha, título)]
+    root=_xml(data)
+    if root is None: return []
+    out=[]
+    for el in root.iter():
+        t=_tag(el)
+        if t not in ("item", "entry"): continue
+        link=title=""; when=None
+        for c in el:
+            ct=_tag(c)
+            if ct=="link" and not link and c.get("rel", "alternate")=="alternate": link=(c.get("href") or c.text or "").strip()
+            elif ct=="title": title=(c.text or "").strip()
+            elif ct in ("pubdate", "updated", "published") and not when: when=parse_date(c.text)
+        if link: out.append((link, when, title))
+    return out
+
+def parse_wp_posts(data:bytes):
+    try: posts=json.loads(data)
+    except ValueError: return []
+    if not isinstance(posts, list): return []
+    return [(p["link"], parse_date(p.get("modified")), re.sub(r"<[^>]+>", "", (p.get("title") or {}).get("rendered", "")))
+            for p in posts if isinstance(p, dict) and p.get("link")]
+
+def feed_links(html:str, base:str):
+    # <link rel="alternate" type="application/rss+xml" href="…"> del home
+    out=[]
+    for tag in _LINK_TAG.findall(html or ""):
+        a={m.group(1).lower(): m.group(2) if m.group(2) is not None else m.group(3) for m in _ATTR.finditer(tag)}
+        if "alternate" in (a.get("rel") or "").lower() and (a.get("type") or "").lower() in FEED_TYPES and a.get("href"):
+            out.append(urljoin(base, a["href"]))
+    return out
+
+def is_wordpress(html:str):
+    return "wp-content/" in (html or "") or "api.w.org" in (html or "")
+
+def discover(seed:str, fetch, home_html:str=None):
+    # fetch(url) → bytes o excepción. Sólo URLs del mismo host que la seed.
+    p=urlparse(seed); base=f"{p.scheme}://{p.netloc}"; host=site_host(seed)
+    found={}
+    def get(url):
+        try: return fetch(url)
+        except Exception: return None
+    def add(url, lastmod, title, via):
+        url=canonical(url)
+        if not url or len(found)>=MAX_ENTRIES or site_host(url)!=host: return
+        key=url_key(url)   # la misma página en el sitemap y en el feed (con ?utm_…, barra final, www.)
+        cur=found.get(key)
+        if cur is None: found[key]=Entry(url, lastmod, title, via)
+        else:
+            if lastmod and (not cur.lastmod or lastmod>cur.lastmod): cur.lastmod=lastmod
+            cur.title=cur.title or title
+
+    # sitemaps: los de robots.txt o, si no declara, los lugares de siempre
+    robots=get(base+"/robots.txt")
+    queue=robots_sitemaps(robots) if robots else []
+    guesses=[] if queue else [base+path for path in SITEMAP_PATHS]
+    queue=queue or list(guesses)
+    read=0
+    while queue and read<MAX_SITEMAPS:
+        url=queue.pop(0); data=get(url)
+        if not data: continue
+        kind, items=parse_sitemap(data)
+        if not kind: continue
+        read+=1
+        if kind=="index":   # los hijos más recientes primero
+            items.sort(key=lambda it: it[1] or datetime.min, reverse=True)
+            queue=[loc for loc, _ in items]+queue
+        else:
+            for loc, lastmod in items: add(loc, lastmod, "", "sitemap")
+        if guesses: queue=[u for u in queue if u not in guesses]; guesses=[]   # con uno alcanza
+
+    # feeds anunciados en el home + API de WordPress (posts con título y fecha de modificación)
+    for url in feed_links(home_html, seed)[:3]:
+        data=get(url)
+        for link, when, title in (parse_feed(data) if data else []): add(link, when, title, "feed")
+    if is_wordpress(home_html):
+        data=get(base+WP_POSTS)
+        for link, when, title in (parse_wp_posts(data) if data else []): add(link, when, title, "wp-json")
+    return list(found.values())
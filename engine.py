@@ -0,0 +1,1273 @@
+# ✨ Artify — motor de búsqueda de convocatorias (sin Streamlit)
+# Crawl curado AR + agregadores, parse con enriquecedores por dominio, dedup. Lo usan app.py y cli.py.
+
+import os, re, time, heapq, asyncio, threading, multiprocessing
+from datetime import date, datetime
+from urllib.parse import urlparse, urljoin
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, wait, FIRST_COMPLETED
+from concurrent.futures.process import BrokenProcessPool
+
+import requests
+from bs4 import BeautifulSoup
+
+from net import http_get, http_stats, PAGES, DeadlineExceeded, ContentRejected
+from aionet import aio_fetcher, available as aio_available
+from cache import http_cache, extract_cache, pdf_cache, content_key, code_version, MISSING_STATUS
+from metrics import timing, timer, snapshot, stage_stats, drain, merge, Gauge
+from health import HEALTH, CircuitOpen
+from discovery import discover
+from parsers import SOUP_FEATURES, Outline, outline
+import pdftext
+from pdftext import pdf_text, available as pdf_available
+from neardup import NearDupIndex
+from records import CSV_HEADER, pack_record, unpack_record
+import canon
+from canon import canonical, site_host, head_canonical, SeenSet, ALIASES
+
+# ───────── Constantes
+HEADERS = {"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64)"}
+REQ_TIMEOUT = 9
+MIN_FETCH_TIME = 0.3   # con menos tiempo que esto no vale la pena abrir el request
+CHUNK = 64*1024
+BYTE_CAPS = {          # máximo a bajar por tipo (se corta ahí; HTML truncado igual parsea)
+    "html": 2*1024*1024, "pdf": 8*1024*1024, "xml": 5*1024*1024, "json": 2*1024*1024, "text": 1024*1024, "other": 1024*1024,
+}
+HEAD_BYTES = 48*1024   # head_only: alcanza para <title>/meta en casi cualquier página
+BINARY_CT = ("image/","video/","audio/","font/","application/zip","application/x-rar","application/x-7z",
+             "application/vnd.","application/msword","application/x-msdownload")
+BINARY_MAGIC = (b"\x89PNG", b"\xff\xd8\xff", b"GIF8", b"PK\x03\x04", b"Rar!", b"7z\xbc\xaf", b"OggS", b"ID3", b"\xd0\xcf\x11\xe0")
+# "threads": un request bloqueante por thread (net); "asyncio": event loop de aionet (hace falta aiohttp)
+FETCH_ENGINE = "asyncio" if os.environ.get("ARTIFY_FETCH")=="asyncio" and aio_available() else "threads"
+
+CURATED_AR_SEEDS = [
+    # Premios/estatales
+    "https://www.klemm.org.ar/",
+    "https://premioklemm.klemm.org.ar/",
+    "https://www.fnartes.gob.ar/",
+    "https://palaisdeglace.cultura.gob.ar/",
+    "https://www.cultura.gob.ar/",
+    "https://enteculturaltucuman.gob.ar/",
+    "https://www.fundacionosde.com.ar/",
+    "https://museorosagalisteo.gob.ar/",
+    "https://www.castagninomacro.org/",
+    "https://museosiivori.buenosaires.gob.ar/",
+    # Agregadores
+    "https://www.catalogosparaartistas.com/convocatorias",
+    "https://es.artealdia.com/Convocatorias",
+    "https://www.recursosculturales.com/",
+]
+
+AGGREGATOR_HOSTS = {
+    "catalogosparaartistas.com",
+    "artealdia.com",
+    "recursosculturales.com",
+}
+
+SKIP_HOSTS = (
+    "instagram.com","facebook.com","x.com","twitter.com","tiktok.com",
+    "youtube.com","linkedin.com","pinterest.","flickr.","tumblr.","vimeo.com"
+)
+SKIP_EXTS = (".jpg",".jpeg",".png",".gif",".webp",".doc",".docx",".xls",".xlsx",".zip",".rar")
+
+GENERIC_BAD_TITLE = re.compile(
+    r"(pol[ií]tica de privacidad|cookies|prensa|press|t[eé]rminos|terms?|acerca|about|colecci[oó]n|historia|contacto|mapa del sitio)",
+    re.I
+)
+
+KEYWORDS = ["convocatoria","premio","salón","salon","residenc","beca","open call","inscripción","cierre","bases","concurso"]
+
+# ───────── Helpers red / texto
+def normalize_url(u: str, base: str):
+    if not u: return None
+    u=u.strip()
+    if u.startswith("//"): u="https:"+u
+    if u.startswith("/"):  u=urljoin(base,u)
+    if not re.match(r"^https?://", u): return None
+    return canonical(u)
+
+def sniff(ct:str, head:bytes):
+    # tipo real según Content-Type + magic bytes del primer chunk (los servers mienten bastante)
+    if head[:4]==b"%PDF" or "application/pdf" in ct: return "pdf"
+    if head.startswith(BINARY_MAGIC) or head[4:8]==b"ftyp" or head[:4]==b"RIFF": return "binary"
+    lead=head[:512].lstrip().lower()
+    looks_html=lead.startswith((b"<!doctype html", b"<html")) or b"<head" in lead or b"<body" in lead
+    if "html" in ct or looks_html: return "html"
+    if "xml" in ct or lead.startswith(b"<?xml") or lead.startswith(b"<urlset") or lead.startswith(b"<rss"): return "xml"
+    if "json" in ct: return "json"
+    if ct.startswith("text/"): return "text"
+    if ct.startswith(BINARY_CT) or ("octet-stream" in ct and not lead.startswith(b"<")): return "binary"
+    return "other"
+
+def set_fetch_engine(name:str):
+    global FETCH_ENGINE
+    if name not in ("threads", "asyncio"): raise ValueError(name)
+    if name=="asyncio" and not aio_available(): raise RuntimeError("el motor asyncio necesita aiohttp instalado")
+    FETCH_ENGINE=name
+
+def fetch_bytes(url:str, keep:bool=False, deadline:float=None, head_only:bool=False, html_only:bool=False,
+                since:float=None):
+    # primero lo que ya bajó el crawl; si no, sesión compartida (keep-alive + reintentos).
+    # head_only: en HTML se corta apenas cierra el <head>; html_only: lo que no es HTML se corta en el primer chunk.
+    # Las respuestas cortadas así sirven para clasificar y no se guardan en ningún caché.
+    # since (time.time() del arranque de una actualización forzada): lo cacheado antes cuenta como vencido → GET
+    # condicional (un 304 no trae cuerpo) en vez de servirlo sin ir a la red.
+    # Con FETCH_ENGINE="asyncio" la red va por el event loop de aionet (este thread sólo espera el resultado).
+    if FETCH_ENGINE=="asyncio": return aio_fetcher().run(afetch_bytes(url, keep, deadline, head_only, html_only, since))
+    hit, hc, ent, headers=_cached(url, keep, since)
+    if hit: return hit
+    try:
+        res, partial=_fetch_network(url, headers, deadline, hc, ent, head_only, html_only)
+    except Exception:
+        if not ent: raise
+        res, partial=(ent.body, ent.ct, ent.final), False   # vencido pero mejor que nada si el host falla
+    if keep and not partial: PAGES.put(url, *res)
+    return res
+
+async def afetch_bytes(url:str, keep:bool=False, deadline:float=None, head_only:bool=False, html_only:bool=False,
+                      since:float=None):
+    # lo mismo que fetch_bytes, para correr en el loop de aionet. El page store es memoria; el caché en disco (SQLite,
+    # cuerpos de hasta 4 MB) va en un thread para no frenar las demás descargas del loop.
+    hit=_page_hit(url, since)
+    if hit: return hit
+    hit, hc, ent, headers=await asyncio.to_thread(_disk_cached, url, keep, since)
+    if hit: return hit
+    try:
+        res, partial=await _afetch_network(url, headers, deadline, hc, ent, head_only, html_only)
+    except Exception:
+        if not ent: raise
+        res, partial=(ent.body, ent.ct, ent.final), False
+    if keep and not partial: PAGES.put(url, *res)
+    return res
+
+def _cached(url:str, keep:bool, since:float=None):
+    # → (respuesta | None, caché http, entrada vencida, headers del request)
+    hit=_page_hit(url, since)
+    if hit: return hit, None, None, None
+    return _disk_cached(url, keep, since)
+
+def _page_hit(url:str, since:float=None):
+    t=time.perf_counter(); hit=PAGES.get(url, since)
+    if hit: timing("fetch.page_store", urlparse(url).netloc, time.perf_counter()-t)
+    return hit
+
+def _disk_cached(url:str, keep:bool, since:float=None):
+    # caché en disco: fresco → sin red; vencido → GET condicional (304 = sin cuerpo)
+    t=time.perf_counter(); host=urlparse(url).netloc
+    hc=http_cache(); ent=hc.get(url, since) if hc else None
+    if ent and ent.valid(since):
+        res=(ent.body, ent.ct, ent.final)
+        if keep: PAGES.put(url, *res)
+        timing("fetch.http_cache", host, time.perf_counter()-t)
+        return res, hc, ent, None
+    return None, hc, ent, dict(HEADERS, **ent.conditional_headers()) if ent else HEADERS
+
+class _BodyReader:
+    # corta en el tope del tipo, al cerrar el <head> si head_only, o si no es HTML con html_only
+    __slots__=("url","ct","deadline","head_only","html_only","chunks","size","cap","kind")
+    def __init__(self, url:str, ct:str, deadline:float, head_only:bool, html_only:bool):
+        self.url=url; self.ct=ct; self.deadline=deadline; self.head_only=head_only; self.html_only=html_only
+        self.chunks=[]; self.size=0; self.cap=None; self.kind=None
+
+    def feed(self, chunk:bytes):
+        # → None para seguir leyendo, o (bytes, parcial) si hay que cortar acá
+        if self.kind is None:
+            self.kind=kind=sniff(self.ct, chunk)
+            if kind=="binary":
+                timing("fetch.rejected", urlparse(self.url).netloc, 0.0)
+                raise ContentRejected(self.url)
+            if self.html_only and kind!="html": return chunk, True
+            self.cap=HEAD_BYTES if self.head_only and kind=="html" else BYTE_CAPS.get(kind, BYTE_CAPS["other"])
+        head_only=self.head_only and self.kind=="html"
+        self.chunks.append(chunk); self.size+=len(chunk)
+        if head_only and b"</head" in b"".join(self.chunks[-2:]).lower():
+            return b"".join(self.chunks), True
+        if self.size>=self.cap:
+            timing("fetch.truncated", urlparse(self.url).netloc, 0.0)
+            return b"".join(self.chunks)[:self.cap], head_only
+        if self.deadline is not None and time.monotonic()>self.deadline: raise DeadlineExceeded(self.url)
+        return None
+
+    def finish(self):
+        return b"".join(self.chunks), False
+
+def _read_body(r, url:str, deadline:float, head_only:bool, html_only:bool=False):
+    # → (bytes, parcial)
+    rd=_BodyReader(url, r.headers.get("Content-Type","").lower(), deadline, head_only, html_only)
+    for chunk in r.iter_content(CHUNK):
+        out=rd.feed(chunk)
+        if out: return out
+    return rd.finish()
+
+async def _aread_body(r, url:str, deadline:float, head_only:bool, html_only:bool=False):
+    rd=_BodyReader(url, r.headers.get("Content-Type","").lower(), deadline, head_only, html_only)
+    async for chunk in r.iter_content(CHUNK):
+        out=rd.feed(chunk)
+        if out: return out
+    return rd.finish()
+
+def _fetch_timeout(url:str, deadline:float):
+    if not HEALTH.allow(url): raise CircuitOpen(url)
+    timeout=HEALTH.timeout(url, REQ_TIMEOUT)   # recortado si el host viene lento o fallando
+    if deadline is not None:   # nunca más que lo que le queda a la búsqueda
+        left=deadline-time.monotonic()
+        if left<=MIN_FETCH_TIME: raise DeadlineExceeded(url)
+        timeout=min(timeout, left)
+    return timeout
+
+def _check_response(r, url:str, ent):
+    # → True si es un 304 que revalida la entrada; si no, valida status y Content-Type antes de leer el cuerpo
+    if r.status_code==304 and ent: return True
+    r.raise_for_status()
+    if r.headers.get("Content-Type","").lower().startswith(BINARY_CT):   # ni el primer chunk
+        timing("fetch.rejected", urlparse(url).netloc, 0.0)
+        raise ContentRejected(url)
+    return False
+
+def _store(r, url:str, res:tuple, partial:bool, hc, ent, revalidated:bool):
+    if revalidated: hc.touch(url, r.headers.get("ETag"), r.headers.get("Last-Modified"))
+    elif hc and not partial and "no-store" not in r.headers.get("Cache-Control","").lower():
+        hc.put(url, res[2], res[1], res[0], r.headers.get("ETag"), r.headers.get("Last-Modified"))
+
+def _record_failure(url:str, e:Exception, ttfb:float):
+    if isinstance(e, DeadlineExceeded): return   # se acabó nuestro tiempo: no es culpa del host
+    if isinstance(e, ContentRejected): HEALTH.record(url, True, ttfb)   # el contenido no sirve, el host anda
+    elif isinstance(e, requests.HTTPError):
+        code=e.response.status_code if e.response is not None else 500
+        HEALTH.record(url, code<500 and code!=429, ttfb)   # un 404 es un host sano
+    else: HEALTH.record(url, False, ttfb)
+
+def _fetch_network(url:str, headers:dict, deadline:float, hc, ent, head_only:bool=False, html_only:bool=False):
+    timeout=_fetch_timeout(url, deadline)
+    host=urlparse(url).netloc
+    t=time.perf_counter(); ttfb=None
+    try:
+        with http_get(url, headers=headers, timeout=timeout) as r:
+            # ttfb: hasta tener los headers (incluye conexión/TLS si hubo que abrir una)
+            ttfb=time.perf_counter()-t; timing("fetch.ttfb", host, ttfb); t=time.perf_counter()
+            partial=False
+            if _check_response(r, url, ent): res=(ent.body, ent.ct, ent.final); revalidated=True
+            else:
+                data, partial=_read_body(r, url, deadline, head_only, html_only)
+                res=(data, r.headers.get("Content-Type","").lower(), r.url); revalidated=False
+                timing("fetch.download", host, time.perf_counter()-t)
+            _store(r, url, res, partial, hc, ent, revalidated)
+    except Exception as e:
+        _record_failure(url, e, ttfb)
+        raise
+    HEALTH.record(url, True, ttfb)
+    return res, partial
+
+async def _afetch_network(url:str, headers:dict, deadline:float, hc, ent, head_only:bool=False, html_only:bool=False):
+    timeout=_fetch_timeout(url, deadline)
+    host=urlparse(url).netloc
+    t=time.perf_counter(); ttfb=None
+    try:
+        async with aio_fetcher().get(url, headers=headers, timeout=timeout) as r:
+            ttfb=time.perf_counter()-t; timing("fetch.ttfb", host, ttfb); t=time.perf_counter()
+            partial=False
+            if _check_response(r, url, ent): res=(ent.body, ent.ct, ent.final); revalidated=True
+            else:
+                data, partial=await _aread_body(r, url, deadline, head_only, html_only)
+                res=(data, r.headers.get("Content-Type","").lower(), r.url); revalidated=False
+                timing("fetch.download", host, time.perf_counter()-t)
+        # ya con la conexión devuelta al pool; la escritura en SQLite fuera del loop
+        await asyncio.to_thread(_store, r, url, res, partial, hc, ent, revalidated)
+    except Exception as e:
+        _record_failure(url, e, ttfb)
+        raise
+    HEALTH.record(url, True, ttfb)
+    return res, partial
+
+def is_pdf(data:bytes, ct:str):
+    return "application/pdf" in ct or data[:4] == b"%PDF"
+
+PDF_VERSION = code_version(pdftext.pdf_text, pdftext._meta_title, pdftext._close_truncated, pdftext.PDF_MAX_PAGES, pdftext.PDF_MAX_CHARS, pdftext.BACKEND)
+
+def read_pdf(data:bytes, host:str=""):
+    # (título, texto de las primeras páginas), cacheado por hash del PDF: da igual desde qué URL llegó
+    pc=pdf_cache() if pdf_available() else None
+    key=content_key(data, PDF_VERSION) if pc else None
+    hit=pc.get(key) if pc else None
+    if hit:
+        timing("pdf.cache_hit", host, 0.0)
+        return hit
+    with timer("pdf.text", host): res=pdf_text(data)
+    if pc: pc.put(key, *res)
+    return res
+
+def bytes_to_html(data:bytes, ct:str):
+    if is_pdf(data, ct): return "", None
+    try: return data.decode("utf-8"), "utf-8"
+    except UnicodeDecodeError:
+        try: return data.decode("latin-1"), "latin-1"
+        except UnicodeDecodeError: return "", None
+
+_REPLACEMENT_RUN = re.compile(r"[\uFFFD]{2,}")
+_CONTROL = re.compile(r"[^\x09\x0A\x0D\x20-\x7E\u00A0-\uFFFF]")   # incluye \x00
+_SPACES = re.compile(r"\s{2,}")
+def cleanup_text(s:str):
+    if not s: return ""
+    if "\uFFFD" in s: s=_REPLACEMENT_RUN.sub(" ", s)
+    return _SPACES.sub(" ", _CONTROL.sub(" ", s)).strip()
+
+def sentences(text:str): return [s.strip() for s in re.split(r"(?<=[\.\!\?])\s+", text) if s.strip()]
+
+# ───────── Fechas ES
+MONTHS={'enero':1,'febrero':2,'marzo':3,'abril':4,'mayo':5,'junio':6,'julio':7,'agosto':8,'septiembre':9,'setiembre':9,'octubre':10,'noviembre':11,'diciembre':12}
+def _mk_date(y,m,d):
+    try: return date(y,m,d)
+    except: return None
+def parse_spanish_date(txt:str):
+    if not txt: return None
+    s=str(txt).lower().replace("º","").replace("°","")
+    s=re.sub(r"(\d)(?:st|nd|rd|th)", r"\1", s)
+    m=re.search(r"(\d{1,2})\s+de\s+([a-zá]+)\s+de\s+(\d{4})", s)
+    if m:
+        d=int(m.group(1)); mon=m.group(2).replace("á","a"); y=int(m.group(3))
+        if mon in MONTHS: return _mk_date(y, MONTHS[mon], d)
+    m=re.search(r"(\d{1,2})[\/\-](\d{1,2})[\/\-](\d{2,4})", s)
+    if m:
+        a=int(m.group(1)); b=int(m.group(2)); y=int(m.group(3))
+        if y<100: y+=2000
+        return _mk_date(y,b,a) or _mk_date(y,a,b)
+    m=re.search(r"(\d{1,2})\.(\d{1,2})\.(\d{4})", s)
+    if m: return _mk_date(int(m.group(3)), int(m.group(2)), int(m.group(1)))
+    return None
+DATE_PATS=[
+    r"(?:fecha(?:\s+l[ií]mite)?(?:\s+de)?\s*(?:aplicaci[oó]n|postulaci[oó]n|cierre|presentaci[oó]n)?:?\s*)(\d{1,2}\s+de\s+\w+\s+\d{4})",
+    r"(?:cierran?\s+el\s+|hasta el\s+)(\d{1,2}\s+de\s+\w+\s+\d{4})",
+    r"(\d{1,2}[\/\-]\d{1,2}[\/\-]\d{2,4})",
+]
+RANGE_PATS=[
+    r"del\s+(\d{1,2}\s+de\s+\w+\s+de\s+\d{4})\s+al\s+(\d{1,2}\s+de\s+\w+\s+de\s+\d{4})",
+    r"del\s+(\d{1,2}[\/\-]\d{1,2}[\/\-]\d{2,4})\s+al\s+(\d{1,2}[\/\-]\d{1,2}[\/\-]\d{2,4})",
+]
+def extract_deadline(text:str):
+    if not text: return None
+    s=str(text)
+    for pat in DATE_PATS:
+        m=re.search(pat,s,re.I)
+        if m:
+            d=parse_spanish_date(m.group(1))
+            if d: return d
+    m=re.search(r"\d{1,2}[\/\-\.]\d{1,2}[\/\-\.]\d{2,4}", s)
+    if m:
+        d=parse_spanish_date(m.group(0))
+        if d: return d
+    return None
+def extract_range(text:str):
+    if not text: return (None,None)
+    s=str(text)
+    for pat in RANGE_PATS:
+        m=re.search(pat,s,re.I)
+        if m: return parse_spanish_date(m.group(1)), parse_spanish_date(m.group(2))
+    m=re.search(r"hasta(?:\s+el)?\s+([^\.;,\n]+)", s, re.I)
+    if m: return None, parse_spanish_date(m.group(1))
+    return (None, extract_deadline(s))
+def days_left(d): return None if not d else (d - date.today()).days
+
+# ───────── Clasificación + resumen
+def extract_title_desc(soup:BeautifulSoup):
+    title=""
+    for sel in ["meta[property='og:title']","meta[name='twitter:title']"]:
+        m=soup.select_one(sel)
+        if m and m.get("content"): title=m["content"]; break
+    if not title:
+        h1=soup.select_one("h1")
+        if h1: title=cleanup_text(h1.get_text(" "))
+    if not title:
+        t=soup.select_one("title")
+        if t: title=cleanup_text(t.get_text())
+    desc=""
+    for sel in ["meta[name='description']","meta[property='og:description']"]:
+        m=soup.select_one(sel)
+        if m and m.get("content"): desc=m["content"]; break
+    if not desc:
+        p=soup.select_one("p")
+        if p: desc=cleanup_text(p.get_text(" "))
+    return (title or "Convocatoria"), (desc or "")
+
+TYPE_RULES = [("Residencias", ("residenc",)), ("Becas", ("beca",)),
+              ("Concursos", ("premio","salón","salon","concurso")), ("Exposiciones", ("exposición","exposicion"))]
+PLACE_RULES = [("Argentina", ("argentina","buenos aires","caba")), ("Internacional", ("internacional",))]
+FREE_WORDS = ("sin costo","sin cargo","gratuito","gratuita","gratis")
+
+def type_guess(text:str):
+    s=(text or "").lower()
+    return next((t for t, words in TYPE_RULES if any(w in s for w in words)), "Convocatorias")
+
+def guess_location(text:str):
+    s=(text or "").lower()
+    return next((t for t, words in PLACE_RULES if any(w in s for w in words)), "—")
+def scope_from_location(loc:str):
+    if loc=="Argentina": return "AR"
+    if loc=="—": return "UNK"
+    return "EX"
+
+def extract_key_data(text:str):
+    s=(text or "")
+    m_amt=re.search(r"(USD|US\$|€|\$)\s?([\d\.\,]+)", s, re.I)
+    premio=f"{m_amt.group(1).upper()} {m_amt.group(2)}" if m_amt else "—"
+    m_slots=re.search(r"(\d+)\s+(cupos|ganadores|becas|finalistas)", s, re.I)
+    cupos=m_slots.group(1) if m_slots else "—"
+    m_fee=re.search(r"(?:fee|arancel|inscripci[oó]n)\s*(?:de)?\s*(USD|US\$|€|\$)?\s*([\d\.\,]+)", s, re.I)
+    fee=(m_fee.group(1) or "$")+" "+m_fee.group(2) if m_fee else "0"
+    return premio, cupos, fee
+
+# ───────── Extracción de campos en una pasada por patrón
+# Lo mismo que extract_range + extract_deadline + extract_key_data + type_guess/guess_location + "gratis", pero con
+# una sola copia en minúsculas del texto y cada patrón buscado a lo sumo una vez. Los patrones se compilan sin
+# re.I sobre esa copia: así re usa la búsqueda rápida por prefijo literal (con re.I recorre carácter a carácter).
+# Si lower() cambia el largo del texto (casos raros de Unicode) los spans no coinciden: se busca con re.I.
+_SCAN_PATS = {
+    "range0": RANGE_PATS[0], "range1": RANGE_PATS[1], "hasta": r"hasta(?:\s+el)?\s+([^\.;,\n]+)",
+    "date0": DATE_PATS[0], "date1": DATE_PATS[1], "date2": DATE_PATS[2], "date_any": r"\d{1,2}[\/\-\.]\d{1,2}[\/\-\.]\d{2,4}",
+    "amount": r"(usd|us\$|€|\$)\s?([\d\.\,]+)", "slots": r"(\d+)\s+(cupos|ganadores|becas|finalistas)",
+    "fee": r"(?:fee|arancel|inscripci[oó]n)\s*(?:de)?\s*(usd|us\$|€|\$)?\s*([\d\.\,]+)",
+}
+_SCAN_LOW = {k: re.compile(p) for k, p in _SCAN_PATS.items()}
+_SCAN_I = {k: re.compile(p, re.I) for k, p in _SCAN_PATS.items()}
+_WORDS = tuple(dict.fromkeys(w for _, ws in TYPE_RULES+PLACE_RULES for w in ws))+FREE_WORDS
+_WORD_LEN = max(map(len, _WORDS))
+_SLOT_WORDS = ("cupos","ganadores","becas","finalistas")   # sin ninguna no hace falta buscar "N cupos"
+
+class Fields:
+    # lo que sale de scan_fields(texto); type_guess/location reciben lo que iba antes del texto (título, descripción)
+    __slots__=("range","deadline","prize","slots","fee","words","free","lead")
+    def type_guess(self, head:str=""):
+        # = type_guess(head + texto)
+        w=self.words|_words_in(head+self.lead)
+        return next((t for t, ws in TYPE_RULES if any(x in w for x in ws)), "Convocatorias")
+    def location(self, head:str=""):
+        # = guess_location(head + texto)
+        w=self.words|_words_in(head+self.lead)
+        return next((t for t, ws in PLACE_RULES if any(x in w for x in ws)), "—")
+
+def _words_in(low:str):
+    low=low.lower()
+    return frozenset(w for w in _WORDS if w in low)
+
+def scan_fields(text:str):
+    s=text or ""; low=s.lower()
+    rx, t=(_SCAN_LOW, low) if len(low)==len(s) else (_SCAN_I, s)
+    find=lambda k: rx[k].search(t)
+    grp=lambda m, i: s[m.start(i):m.end(i)] if m.start(i)>=0 else None   # del texto original (mismo span)
+    f=Fields(); f.words=_words_in(low); f.lead=s[:_WORD_LEN-1]
+    f.free=any(w in f.words for w in FREE_WORDS)
+    # extract_deadline: el primer match de cada patrón, en orden, que dé una fecha válida
+    d=None
+    for k in ("date0", "date1", "date2"):
+        hit=find(k)
+        if hit and (d:=parse_spanish_date(grp(hit, 1))): break
+    else:
+        hit=find("date_any")
+        if hit: d=parse_spanish_date(grp(hit, 0))
+    f.deadline=d
+    # extract_range
+    hit=find("range0") or find("range1")
+    if hit: f.range=(parse_spanish_date(grp(hit, 1)), parse_spanish_date(grp(hit, 2)))
+    else:
+        hit=find("hasta")
+        f.range=(None, parse_spanish_date(grp(hit, 1))) if hit else (None, f.deadline)
+    # extract_key_data
+    hit=find("amount"); f.prize=f"{grp(hit, 1).upper()} {grp(hit, 2)}" if hit else "—"
+    hit=find("slots") if any(w in low for w in _SLOT_WORDS) else None; f.slots=grp(hit, 1) if hit else "—"
+    hit=find("fee"); f.fee=(grp(hit, 1) or "$")+" "+grp(hit, 2) if hit else "0"
+    return f
+
+def smart_title_guess(title:str, text:str, domain:str):
+    raw = (title or "").strip()
+    if raw and not re.fullmatch(r"(convocatoria|home|inicio|noticias?)", raw, re.I):
+        base = raw
+    else:
+        base = ""
+    parts = re.split(r"\s*[|\-—–·]\s*", base) if base else []
+    if not parts:
+        m=re.search(r"(premio|sal[oó]n|residenc\w+|beca|open call|convocatoria)[^\.]{0,80}", (text or ""), re.I)
+        if m: parts=[m.group(0)]
+    if not parts:
+        return f"Convocatoria ({domain.replace('www.','')})"
+    best=None; score_best=-1
+    for p in parts:
+        s=0
+        s+=sum(k in p.lower() for k in ["premio","salón","salon","residenc","beca","convocatoria","open call"])
+        s+=len(re.findall(r"20\d{2}", p))
+        if s>score_best: score_best=s; best=p
+    def friendly_tc(x):
+        words=x.split()
+        out=[]
+        for w in words:
+            if len(w)<=3 and w.isupper(): out.append(w)
+            elif w.lower() in {"de","del","la","las","los","y","en","a","al","para"}: out.append(w.lower())
+            else: out.append(w[:1].upper()+w[1:].lower())
+        return " ".join(out)
+    return friendly_tc(best.strip(" .:;-"))[:140]
+
+NO_SUMMARY = "Publicación con poca descripción. Abrí “Bases / Reglamento” para ver requisitos."
+PDF_SUMMARY = "Documento PDF de bases / reglamento. Abrí el enlace para ver requisitos."
+
+def resumen_ia(text:str,n=3,max_chars=360):
+    txt=cleanup_text(text or "")
+    if not txt: return NO_SUMMARY
+    sents=sentences(txt)
+    scored=[]
+    for s in sents:
+        score=sum(int(k in s.lower()) for k in KEYWORDS)+len(re.findall(r"\d{4}", s))
+        scored.append((score,s))
+    scored.sort(reverse=True)
+    chosen=[s for _,s in scored[:n]] or sents[:n]
+    res=" ".join(chosen)
+    return (res[:max_chars]+"…") if len(res)>max_chars else res
+
+# ───────── Links
+def best_links(soup: BeautifulSoup, base_url: str, anchors=None):
+    links={"principal":None,"bases":None,"inscripcion":None,"pdfs":[]}
+    og=soup.select_one("meta[property='og:url']")
+    if og and og.get("content"): links["principal"]=normalize_url(og["content"],base_url)
+    if not links["principal"]:
+        can=soup.select_one("link[rel='canonical']")
+        if can and can.get("href"): links["principal"]=normalize_url(can["href"],base_url)
+    if anchors is None:
+        anchors=[((a.get_text(" ") or "").strip().lower(), normalize_url(a["href"], base_url)) for a in soup.select("a[href]")]
+    candidates=[]
+    for text, href in anchors:
+        if not href: continue
+        candidates.append((text, href))
+        if href.lower().endswith(".pdf"): links["pdfs"].append(href)
+    def pick(patterns, avoid_pdf=True):
+        for txt, href in candidates:
+            if avoid_pdf and href.lower().endswith(".pdf"): continue
+            if any(p in txt for p in patterns): return href
+        return None
+    links["inscripcion"]=pick(["inscrip","postul","apply","registro","formulario","aplicar"])
+    links["bases"]=pick(["base","reglamento","condicion","término","terms","rules"], avoid_pdf=False)
+    if not links["principal"]:
+        for txt, href in candidates:
+            if href and not href.endswith("#"): links["principal"]=href; break
+    if not links["bases"]:
+        for p in links["pdfs"]:
+            links["bases"]=p; break
+    return links
+
+# ───────── Documento parseado (una descarga, un soup, un texto por página)
+class Doc:
+    # html/soup/texto se construyen recién cuando alguien los pide (un hit del caché de extracción no los toca);
+    # el crawl usa outline (título + texto + links) que no necesita el árbol de BeautifulSoup
+    __slots__=("url","final","data","ct","_html","_soup","_text","_lower","_anchors","_outline","_fields","_pdf")
+    def __init__(self, url:str, data:bytes, ct:str, final:str):
+        self.url=url; self.final=final; self.data=data; self.ct=ct
+        self._html=None; self._soup=None; self._text=None; self._lower=None; self._anchors=None; self._outline=None
+        self._fields=None; self._pdf=None
+    @property
+    def html(self):
+        if self._html is None: self._html,_=bytes_to_html(self.data, self.ct)
+        return self._html
+    @property
+    def soup(self):
+        if self._soup is None and self.html:
+            with timer("doc.soup", urlparse(self.url).netloc): self._soup=BeautifulSoup(self.html, SOUP_FEATURES)
+        return self._soup
+    @property
+    def pdf(self):
+        # (título de los metadatos, texto crudo de las primeras páginas); ("", "") si no es un PDF legible
+        if self._pdf is None:
+            self._pdf=read_pdf(self.data, urlparse(self.url).netloc) if is_pdf(self.data, self.ct) else ("", "")
+        return self._pdf
+    @property
+    def text(self):
+        if self._text is None:
+            soup=self.soup; self._text=""
+            host=urlparse(self.url).netloc
+            if soup:
+                with timer("doc.get_text", host): raw=soup.get_text(" ")
+                with timer("doc.cleanup_text", host): self._text=cleanup_text(raw)
+            elif self.pdf[1]:
+                with timer("doc.cleanup_text", host): self._text=cleanup_text(self.pdf[1])
+        return self._text
+    @property
+    def lower(self):
+        if self._lower is None: self._lower=self.text.lower()
+        return self._lower
+    @property
+    def fields(self):
+        # fechas, montos, cupos, tipo/lugar y "gratis" del texto, en una pasada (scan_fields)
+        if self._fields is None:
+            with timer("doc.fields", urlparse(self.url).netloc): self._fields=scan_fields(self.text)
+        return self._fields
+    @property
+    def outline(self):
+        if self._outline is None:
+            if self._soup is not None:   # ya está el árbol: no parsear dos veces
+                s=self._soup
+                self._outline=Outline(s.title.get_text() if s.title else "", s.get_text(" "),
+                                      [(a["href"], a.get_text(" ") or "") for a in s.select("a[href]")])
+            else:
+                with timer("doc.outline", urlparse(self.url).netloc): self._outline=outline(self.html)
+        return self._outline
+    @property
+    def anchors(self):
+        # [(texto del link en minúsculas, href normalizado o None)]
+        if self._anchors is None:
+            self._anchors=[((a.get_text(" ") or "").strip().lower(), normalize_url(a["href"], self.final))
+                           for a in self.soup.select("a[href]")] if self.soup else []
+        return self._anchors
+
+def load_doc(url:str, keep:bool=False, deadline:float=None, head_only:bool=False, html_only:bool=False, since:float=None):
+    data, ct, final = fetch_bytes(url, keep=keep, deadline=deadline, head_only=head_only, html_only=html_only, since=since)
+    return Doc(url, data, ct, final)
+
+def learn_canonical(doc:Doc):
+    # redirect + <link rel=canonical>/og:url: la URL pedida (y la final) pasan a ser alias de la página declarada.
+    # → la URL canónica de la página
+    target=(head_canonical(doc.html, doc.final) if doc.html else None) or doc.final
+    ALIASES.learn(doc.url, target); ALIASES.learn(doc.final, target)
+    return target
+
+# ───────── Parse genérico (relajado) — NO descarto por “cookies” del cuerpo
+def parse_doc(doc:Doc):
+    try:
+        final=doc.final
+        if not doc.html:  # PDF/binario
+            domain=urlparse(final).netloc.replace("www.","")
+            fname = final.split("/")[-1]
+            if doc.text: return parse_pdf(doc, domain, fname)
+            title = smart_title_guess(fname, "", domain)   # binario, PDF escaneado/roto o sin pypdf: sólo el link
+            return {
+                "source": domain, "title": title or f"Documento PDF — {domain}", "url": final,
+                "open_at": None, "deadline": None, "type": "Convocatorias",
+                "location":"—","scope":"UNK", "prize":"—","slots":"—","fee":"0","free":True,
+                "summary": PDF_SUMMARY,
+                "links": {"principal": final, "bases": final, "inscripcion": None, "pdfs":[final]},
+            }
+
+        soup=doc.soup
+        raw_title, meta_desc = extract_title_desc(soup)
+        # filtro genérico SOLO por título/URL
+        if GENERIC_BAD_TITLE.search((raw_title or "") + " " + final): 
+            return None
+
+        full = doc.text
+        f = doc.fields   # = extract_range / type_guess / guess_location / extract_key_data, en una pasada
+        abre, cierra = f.range
+        tipo = f.type_guess(raw_title+" "+meta_desc+" ")
+        loc  = f.location(raw_title+" ")
+        premio, cupos, fee = f.prize, f.slots, f.fee
+        titulo = smart_title_guess(raw_title, full, urlparse(final).netloc)
+        resumen = resumen_ia(meta_desc or full)
+        links = best_links(soup, final, doc.anchors)
+        free = f.free
+        return {
+            "source": urlparse(final).netloc.replace("www.",""),
+            "title": titulo, "url": final,
+            "open_at": abre, "deadline": cierra,
+            "type": tipo, "location": loc, "scope": scope_from_location(loc),
+            "prize": premio, "slots": cupos, "fee": fee, "free": free,
+            "summary": resumen, "links": links
+        }
+    except Exception:
+        return None
+
+def parse_pdf(doc:Doc, domain:str, fname:str):
+    # bases/reglamento con texto: fechas, premio y resumen salen del PDF (pdftext lee sólo las primeras páginas)
+    pdf_title, full = doc.pdf[0], doc.text
+    f = doc.fields
+    abre, cierra = f.range
+    loc = f.location(pdf_title+" ")
+    titulo = smart_title_guess(pdf_title, doc.pdf[1].replace("\n", ". "), domain)   # el título no cruza renglones
+    if titulo.startswith("Convocatoria ("): titulo = smart_title_guess(fname, "", domain)
+    return {
+        "source": domain, "title": titulo, "url": doc.final,
+        "open_at": abre, "deadline": cierra,
+        "type": f.type_guess(pdf_title+" "), "location": loc, "scope": scope_from_location(loc),
+        "prize": f.prize, "slots": f.slots, "fee": f.fee, "free": f.free,
+        "summary": resumen_ia(full),
+        "links": {"principal": doc.final, "bases": doc.final, "inscripcion": None, "pdfs": [doc.final]},
+    }
+
+def parse_generic(url:str):
+    try: return parse_doc(load_doc(url))
+    except Exception: return None
+
+# Enriquecedores por dominio (retoques en título/links/fechas sobre el mismo Doc)
+def enrich_klemm(rec:dict, doc:Doc):
+    low=doc.lower
+    if "premio" in low and "klemm" in low:
+        rec["type"]="Concursos"
+        if "klemm" not in rec["title"].lower():
+            rec["title"]=smart_title_guess("Premio Klemm", doc.text, urlparse(doc.final).netloc)
+    for tx, href in doc.anchors:
+        href=href or ""
+        if "inscrip" in tx or "postul" in tx or "premioklemm" in href: rec["links"]["inscripcion"]=href
+        if "base" in tx or href.lower().endswith(".pdf"): rec["links"]["bases"]=href
+
+def enrich_fna(rec:dict, doc:Doc):
+    if "beca" in doc.lower: rec["type"]="Becas"
+    dl=doc.fields.deadline; rec["deadline"]=dl or rec["deadline"]
+    for tx, href in doc.anchors:
+        href=href or ""
+        if any(k in tx for k in ["inscrip","postul","formulario","aplicar"]) or "forms.gle" in href:
+            rec["links"]["inscripcion"]=href
+        if "base" in tx or "reglamento" in tx:
+            rec["links"]["bases"]=href
+    if "fondo nacional de las artes" not in rec["title"].lower():
+        rec["title"]="FNA — " + rec["title"]
+
+def enrich_palais(rec:dict, doc:Doc):
+    low=doc.lower
+    if "salón nacional" in low or "salon nacional" in low:
+        rec["type"]="Concursos"
+        if "salón nacional" not in rec["title"].lower():
+            rec["title"]="Salón Nacional — " + rec["title"]
+    dl=doc.fields.deadline; rec["deadline"]=dl or rec["deadline"]
+    _bases_inscripcion(rec, doc)
+
+def enrich_tucuman(rec:dict, doc:Doc):
+    if "salón nacional de tucumán" in doc.lower:
+        rec["type"]="Concursos"
+        if "tucumán" not in rec["title"].lower():
+            rec["title"]="Salón Nacional de Tucumán — " + rec["title"]
+    dl=doc.fields.deadline; rec["deadline"]=dl or rec["deadline"]
+    _bases_inscripcion(rec, doc)
+
+def enrich_osde(rec:dict, doc:Doc):
+    low=doc.lower
+    if "premio" in low and "osde" in low:
+        rec["type"]="Concursos"
+        if "osde" not in rec["title"].lower():
+            rec["title"]="Premio OSDE — " + rec["title"]
+    dl=doc.fields.deadline; rec["deadline"]=dl or rec["deadline"]
+    _bases_inscripcion(rec, doc)
+
+def _bases_inscripcion(rec:dict, doc:Doc):
+    for tx, href in doc.anchors:
+        href=href or ""
+        if "inscrip" in tx or "postul" in tx: rec["links"]["inscripcion"]=href
+        if "base" in tx or "reglamento" in tx or href.lower().endswith(".pdf"): rec["links"]["bases"]=href
+
+DOMAIN_PARSERS = {
+    "klemm.org.ar": enrich_klemm,
+    "premioklemm.klemm.org.ar": enrich_klemm,
+    "fnartes.gob.ar": enrich_fna,
+    "palaisdeglace.cultura.gob.ar": enrich_palais,
+    "cultura.gob.ar": enrich_palais,
+    "enteculturaltucuman.gob.ar": enrich_tucuman,
+    "fundacionosde.com.ar": enrich_osde,
+}
+
+# cambia sola cuando cambia el código de extracción → invalida el caché de registros
+EXTRACT_VERSION = code_version(
+    normalize_url, canon.canonical, canon._query, canon._tracking, canon.TRACKING_PARAMS, canon.TRACKING_PREFIXES,
+    bytes_to_html, cleanup_text, sentences, parse_spanish_date, MONTHS, DATE_PATS, RANGE_PATS,
+    extract_deadline, extract_range, extract_title_desc, TYPE_RULES, PLACE_RULES, FREE_WORDS, scope_from_location,
+    extract_key_data, _SCAN_PATS, _SLOT_WORDS, Fields, _words_in, scan_fields,
+    smart_title_guess, resumen_ia, NO_SUMMARY, PDF_SUMMARY, KEYWORDS, best_links, GENERIC_BAD_TITLE, Doc, parse_doc, parse_pdf, PDF_VERSION, SOUP_FEATURES,
+    _bases_inscripcion, *sorted(set(DOMAIN_PARSERS.values()), key=lambda f: f.__name__), sorted(DOMAIN_PARSERS),
+)
+
+def extract_record(url:str, doc:Doc):
+    host=urlparse(url).netloc.lower().replace("www.","")
+    with timer("extract.parse_doc", host): rec=parse_doc(doc)
+    if not rec or not doc.soup: return rec
+    enrich=DOMAIN_PARSERS.get(host)
+    if enrich:
+        with timer("extract."+enrich.__name__, host):
+            try: enrich(rec, doc)
+            except Exception: pass
+    return rec
+
+# ───────── Extracción en procesos
+# BeautifulSoup, cleanup_text y los extractores son CPU y el GIL los serializa: los threads de Search sólo bajan
+# y le pasan los bytes crudos a un pool de procesos, que devuelve el registro empaquetado en una tupla.
+# 0 workers = se extrae en el mismo thread que bajó la página (máquinas de un core).
+EXTRACT_WORKERS = int(os.environ.get("ARTIFY_EXTRACT_WORKERS") or max(0, (os.cpu_count() or 1)-1))
+
+def _extract_worker(url:str, data:bytes, ct:str, final:str):
+    # corre en el proceso del pool; devuelve también sus tiempos por etapa para sumarlos en el principal
+    rec=extract_record(url, Doc(url, data, ct, final))
+    return pack_record(rec), drain()
+
+_pool=None; _pool_n=0; _pool_lock=threading.Lock()
+
+def extract_pool(workers:int):
+    # uno por proceso y reusado entre corridas (levantar los workers cuesta importar bs4/lxml en cada uno)
+    global _pool, _pool_n
+    if workers<=0: return None
+    with _pool_lock:
+        if _pool is None or _pool_n!=workers:
+            if _pool: _pool.shutdown(wait=False, cancel_futures=True)
+            _pool=ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")); _pool_n=workers
+        return _pool
+
+def _drop_pool(pool):
+    global _pool
+    with _pool_lock:
+        if _pool is pool: _pool=None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+def close_extract_pool():
+    # al salir de un proceso hijo de multiprocessing hay que cerrarlo a mano (ahí no corre el atexit del executor)
+    global _pool
+    with _pool_lock: pool, _pool=_pool, None
+    if pool: pool.shutdown(wait=True, cancel_futures=True)
+
+def extract_in_pool(pool, url:str, doc:Doc, deadline:float=None):
+    left=None if deadline is None else deadline-time.monotonic()
+    if left is not None and left<=0: raise DeadlineExceeded(url)
+    try: fut=pool.submit(_extract_worker, url, doc.data, doc.ct, doc.final)
+    except RuntimeError:   # pool roto o ya cerrado (BrokenProcessPool es un RuntimeError): se extrae acá
+        _drop_pool(pool)
+        return extract_record(url, doc)
+    try: packed, stages=fut.result(timeout=left)
+    except TimeoutError:
+        fut.cancel(); raise DeadlineExceeded(url)
+    except BrokenProcessPool:   # un worker murió; un error del extractor (aunque sea RuntimeError) sigue de largo
+        _drop_pool(pool)
+        return extract_record(url, doc)
+    merge(stages)
+    return unpack_record(packed)
+
+def parse_page(url:str, doc:Doc=None, deadline:float=None, pool=None, since:float=None):
+    with timer("parse_page", urlparse(url).netloc):
+        try: return _parse_page(url, doc, deadline, pool, since)
+        except DeadlineExceeded: return None
+
+def _parse_page(url:str, doc:Doc, deadline:float, pool, since:float=None):
+    try: doc=doc or load_doc(url, deadline=deadline, since=since)
+    except Exception: return None
+    learn_canonical(doc)
+    extract=(lambda: extract_in_pool(pool, url, doc, deadline)) if pool else (lambda: extract_record(url, doc))
+    # mismo cuerpo + misma URL + mismo extractor → mismo registro, sin BeautifulSoup
+    ec=extract_cache()
+    if not ec: return extract()
+    key=content_key(doc.data, doc.final, urlparse(url).netloc.lower(), EXTRACT_VERSION)
+    hit, rec=ec.get(key)
+    if hit:
+        timing("extract.cache_hit", urlparse(url).netloc, 0.0)
+        return rec
+    rec=extract()
+    ec.put(key, rec)
+    return rec
+
+# ───────── Crawl curado (sigue externos en AGGREGATOR_HOSTS)
+CRAWL_WORKERS = 8          # descargas simultáneas del crawl (todas las semillas a la vez)
+CRAWL_INFLIGHT_ASYNC = 64  # ídem con FETCH_ENGINE="asyncio": las descargas no ocupan threads, sólo el outline
+HOST_MAX_INFLIGHT = 2      # cortesía: requests simultáneos por host (HEALTH lo baja a 1 o lo duplica según el host)
+HOST_MIN_DELAY = 0.25      # cortesía: segundos entre requests al mismo host
+DISCOVERY_MAX_AGE = 400    # días: una URL de sitemap/feed más vieja que esto no se propone (las convocatorias vencen)
+
+CALL_URL_HINTS = ("/convocatoria","/premio","/residenc","/salon","/salón","/beca")
+CALL_TEXT_HINTS = ("convocatoria","premio","salón","salon","residenc","beca","open call","exposición","exposicion")
+
+def call_hints(url:str, text:str):
+    u=url.lower(); s=(text or "").lower()
+    return sum(k in u for k in CALL_URL_HINTS)+sum(k in s for k in CALL_TEXT_HINTS)
+
+def seems_call(url:str, text:str):
+    return call_hints(url, text)>0
+
+# ───────── Prioridad de la frontera: pistas en URL y texto del link, profundidad y rendimiento del prefijo
+FRONTIER_WORDS = tuple(dict.fromkeys((*CALL_TEXT_HINTS, *KEYWORDS)))
+SEED_SCORE = 100.0
+
+def url_prefix(url:str):
+    seg=urlparse(url).path.strip("/").split("/", 1)[0]
+    return "/"+seg.lower()
+
+def link_score(url:str, anchor:str, depth:int, prefix_yield:float=0.0):
+    path=urlparse(url).path.lower(); a=(anchor or "").lower()
+    s=3*sum(k in path for k in CALL_URL_HINTS)+2*sum(k in a for k in FRONTIER_WORDS)
+    s+=sum(k in path.replace("-"," ").replace("_"," ") for k in CALL_TEXT_HINTS)
+    if GENERIC_BAD_TITLE.search(f"{a} {path}"): s-=3
+    return s-depth+4*prefix_yield
+
+def rank_discovered(entries, now:datetime=None):
+    # URLs de sitemaps/feeds que parecen convocatoria (por la URL o el título), las más pistas y más nuevas primero
+    now=now or datetime.utcnow()
+    ranked=[]
+    for e in entries:
+        if e.lastmod and (now-e.lastmod).days>DISCOVERY_MAX_AGE: continue
+        text=f"{e.title} {urlparse(e.url).path.replace('-',' ').replace('_',' ')}"
+        if GENERIC_BAD_TITLE.search(text): continue
+        hints=call_hints(e.url, text)
+        if hints: ranked.append((hints, e.lastmod or datetime.min, e.url))
+    ranked.sort(reverse=True)
+    return [u for _, _, u in ranked]
+
+class _Frontier:
+    # heap de (−score, orden, url, profundidad, texto del link). Con tope: llena, una URL nueva sólo entra si le gana
+    # a la peor. Al sacar se vuelve a puntuar (el rendimiento de los prefijos cambia después de encolar).
+    __slots__=("heap","cap","_seq")
+    def __init__(self, cap:int):
+        self.heap=[]; self.cap=cap; self._seq=0
+    def __len__(self): return len(self.heap)
+    def push(self, url:str, score:float, depth:int, anchor:str=""):
+        item=(-score, self._seq, url, depth, anchor); self._seq+=1
+        if len(self.heap)>=self.cap:
+            worst=max(self.heap)
+            if item>=worst: return False
+            self.heap.remove(worst); heapq.heapify(self.heap)
+        heapq.heappush(self.heap, item)
+        return True
+    def pop(self, rescore):
+        while True:
+            neg, seq, url, depth, anchor=heapq.heappop(self.heap)
+            fresh=rescore(url, anchor, depth)
+            if fresh==-neg or not self.heap or -fresh<=self.heap[0][0]: return url, depth
+            heapq.heappush(self.heap, (-fresh, seq, url, depth, anchor))
+
+class _Site:
+    __slots__=("seed","host","limit","follow_external","external_cap","queue","visited","inflight","last","external",
+               "discovery","bfs","discovered","yields")
+    def __init__(self, seed:str, limit:int, follow_external:bool, external_cap:int, discovery:bool=True, cap:int=40):
+        self.seed=seed; self.host=site_host(seed); self.limit=limit
+        self.follow_external=follow_external; self.external_cap=external_cap
+        self.queue=_Frontier(max(1, cap)); self.queue.push(seed, SEED_SCORE, 0)
+        self.visited=0; self.inflight=0; self.last=0.0; self.external=0
+        self.discovery="pending" if discovery else "done"   # pending → running → done
+        self.bfs=True; self.discovered=None                  # sin sitemap/feed útil se sigue con BFS
+        self.yields={}   # prefijo de path → [visitadas, con hallazgos]
+
+    def prefix_yield(self, url:str):
+        # centrado en 0 y suavizado: un prefijo sin visitas no suma ni resta
+        v, h=self.yields.get(url_prefix(url), (0, 0))
+        return (h+0.5)/(v+1)-0.5
+
+    def score(self, url:str, anchor:str, depth:int):
+        if depth==0: return SEED_SCORE
+        return link_score(url, anchor, depth, self.prefix_yield(url))
+
+class Crawler:
+    # frontera por host (heap por prioridad), presupuesto global de páginas y cortesía por host; cada URL candidata
+    # sale por on_found apenas se descubre. Antes del BFS cada host pasa por discovery (sitemaps/feeds): si da
+    # candidatas, salen directo y del host sólo se visita la seed. URLs en forma canónica (canon) y dos SeenSet
+    # compartidos por todos los hosts: encoladas (frontera + discovery) y emitidas al parse.
+    def __init__(self, seeds, per_site_limit:int, budget:int, external_cap:int=12, found_limit:int=None,
+                 follow_external=None, on_found=None, workers:int=None, deadline:float=None,
+                 discovery:bool=True, known=None, min_delay:float=None, since:float=None):
+        self.sites={}; self.seen=SeenSet()
+        for s in seeds:
+            s=canonical(s) or s; host=site_host(s)
+            if not self.seen.add(s): continue
+            if host in self.sites:
+                self.sites[host].queue.push(s, SEED_SCORE, 0)
+                continue
+            fe=follow_external(s) if callable(follow_external) else bool(follow_external)
+            self.sites[host]=_Site(s, per_site_limit, fe, external_cap, discovery, cap=per_site_limit*2)
+        self.per_site_limit=per_site_limit; self.budget=budget; self.found_limit=found_limit
+        self.aio=FETCH_ENGINE=="asyncio"
+        self.workers=workers or (CRAWL_INFLIGHT_ASYNC if self.aio else CRAWL_WORKERS)
+        self.on_found=on_found; self.deadline=deadline; self.since=since   # since: ver fetch_bytes
+        self.min_delay=HOST_MIN_DELAY if min_delay is None else min_delay   # cortesía entre requests al mismo host
+        self.known=known   # known(url) → True: ya tiene registro (o es copia de otra fuente), no se emite
+        self.fetched=0; self.inflight=0; self.found=[]; self._emitted=SeenSet(); self.known_skipped=0
+        self.queue_depth=Gauge(); self.busy=Gauge()   # muestreados en cada vuelta del loop de run()
+        self._cv=threading.Condition(); self._stop=threading.Event()
+
+    def stop(self):
+        self._stop.set()
+        with self._cv: self._cv.notify_all()
+
+    def frontier_size(self):
+        with self._cv: return sum(len(s.queue) for s in self.sites.values())
+
+    def _expired(self):
+        return self.deadline is not None and time.monotonic()>=self.deadline
+
+    def _next(self):
+        # → (site, url, profundidad, espera): la URL más prometedora lista para pedir (url=None: discovery del host),
+        # o cuánto esperar por la cortesía del host
+        now=time.monotonic(); wait=None
+        for site in self.sites.values():
+            if site.discovery=="running": continue
+            if site.discovery=="pending":
+                if HEALTH.is_open(site.seed): continue
+                site.discovery="running"; site.inflight+=1; self.inflight+=1
+                return site, None, 0, None
+            if not site.queue or site.visited>=site.limit or site.inflight>=HEALTH.limit(site.seed, HOST_MAX_INFLIGHT): continue
+            dt=site.last+self.min_delay-now
+            if dt>0:
+                wait=dt if wait is None else min(wait, dt); continue
+            if HEALTH.is_open(site.seed): continue   # circuito abierto: sus slots y su presupuesto van a otros hosts
+            site.visited+=1; site.inflight+=1; site.last=now
+            self.fetched+=1; self.inflight+=1
+            url, depth=site.queue.pop(site.score)
+            return site, url, depth, None
+        return None, None, 0, wait
+
+    def run(self):
+        with ThreadPoolExecutor(max_workers=min(self.workers, CRAWL_WORKERS) if self.aio else self.workers) as ex:
+            with self._cv:
+                while not self._stop.is_set() and self.fetched<self.budget and not self._expired():
+                    self.queue_depth.add(sum(len(s.queue) for s in self.sites.values())); self.busy.add(self.inflight)
+                    site=None; wait=None
+                    if self.inflight<self.workers:
+                        site, url, depth, wait=self._next()
+                    if site:
+                        if url is None: ex.submit(self._discover, site)
+                        elif self.aio: self._visit_async(site, url, depth, ex)
+                        else: ex.submit(self._visit, site, url, depth)
+                        continue
+                    if self.inflight==0 and wait is None: break   # frontera agotada
+                    self._cv.wait(wait if wait is not None else 0.5)
+                while self.inflight and not self._stop.is_set() and not self._expired():
+                    self._cv.wait(0.5)
+        return self.found
+
+    def _discovery_cap(self, site:_Site):
+        # reparto parejo del found_limit entre hosts: que el primer sitemap no se lleve todo
+        cap=site.limit//2
+        if self.found_limit: cap=min(cap, max(3, -(-self.found_limit//len(self.sites))))
+        return cap
+
+    def _discover(self, site:_Site, _url=None, _depth=0):
+        urls=[]; t=time.perf_counter()
+        try:
+            home=None
+            try: home=load_doc(site.seed, keep=True, deadline=self.deadline, since=self.since).html   # el BFS la toma de PAGES
+            except Exception: pass
+            entries=discover(site.seed, self._discovery_fetch, home)
+            urls=rank_discovered(entries)[:self._discovery_cap(site)]
+        except Exception:
+            entries=[]
+        finally:
+            with self._cv:
+                site.discovery="done"; site.discovered=(len(entries), len(urls))
+                if urls:
+                    site.bfs=False; self.seen.update(urls)
+                site.inflight-=1; self.inflight-=1
+                self._cv.notify_all()
+            timing("crawl.discover", site.host, time.perf_counter()-t)
+        for u in urls: self._emit(u)
+
+    def _discovery_fetch(self, url:str):
+        # robots/sitemaps/feeds/wp-json adivinados: la mayoría no existe. Un 404/410 queda en el caché HTTP
+        # (MISSING_TTL) y las próximas corridas ni lo piden: vacío = "no hay"
+        hc=http_cache()
+        if hc and hc.is_missing(url):
+            timing("crawl.discover_missing", urlparse(url).netloc, 0.0)
+            return b""
+        try: return fetch_bytes(url, deadline=self.deadline, since=self.since)[0]
+        except requests.HTTPError as e:
+            code=e.response.status_code if e.response is not None else None
+            if hc and code in MISSING_STATUS: hc.put_missing(url, code)
+            raise
+
+    def _head_only(self, site:_Site):
+        # si no hacen falta los links (hubo discovery y el host no es agregador) alcanza con el <head>
+        # para decidir si la página parece convocatoria
+        return not (site.bfs or site.follow_external)
+
+    def _visit(self, site:_Site, url:str, depth:int=0):
+        t=time.perf_counter()
+        try: doc=load_doc(url, keep=True, deadline=self.deadline, head_only=self._head_only(site), html_only=True,
+                          since=self.since)   # queda en PAGES para el parse
+        except Exception: doc=None
+        self._visited(site, url, depth, doc, t)
+
+    def _visit_async(self, site:_Site, url:str, depth:int, ex):
+        # la descarga queda en el loop de aionet; outline y links vuelven al pool de threads
+        t=time.perf_counter()
+        def done(f):
+            try: doc=Doc(url, *f.result())
+            except Exception: doc=None
+            try: ex.submit(self._visited, site, url, depth, doc, t)
+            except RuntimeError: self._visited(site, url, depth, doc, t)   # el pool ya cerró (stop/deadline)
+        aio_fetcher().submit(afetch_bytes(url, True, self.deadline, self._head_only(site), True, self.since)).add_done_callback(done)
+
+    def _visited(self, site:_Site, url:str, depth:int, doc:Doc, t:float):
+        hits=[]; links={}; canon_url=None
+        try:
+            if doc: canon_url=learn_canonical(doc)   # variantes que apunten a esta página ya cuentan como vistas
+            ol=doc.outline if doc and doc.html else None   # título + texto + links, sin armar el soup
+
+            # ¿la propia página parece convocatoria?
+            if ol and seems_call(url, cleanup_text(ol.text)) and not GENERIC_BAD_TITLE.search(ol.title+" "+doc.final):
+                hits.append(url)
+
+            # recolectar links
+            for href, anchor in (ol.links if ol else []):
+                href=href.strip()
+                if not href or href.startswith("#"): continue
+                u=canonical(href, url)   # None: mailto:, javascript:, tel:…
+                if not u: continue
+                p=urlparse(u)
+                if any(p.path.lower().endswith(ext) for ext in SKIP_EXTS): continue
+                if any(b in p.netloc for b in SKIP_HOSTS): continue
+                internal=site_host(u)==site.host
+                if not internal and not site.follow_external: continue
+                if internal and p.path.lower().endswith(".pdf"):   # sin links adentro: se decide por la URL
+                    if seems_call(u, "") and not GENERIC_BAD_TITLE.search(u): hits.append(u)
+                    continue
+                # el mismo destino con varios textos (menú + cuerpo) suma todas las pistas
+                links[u]=f"{links.get(u, '')} {anchor or ''}"[:300]
+        finally:
+            with self._cv:
+                if canon_url: self.seen.add(canon_url)
+                for u, link_text in links.items():
+                    if site_host(u)!=site.host:
+                        if site.external<site.external_cap and seems_call(u, link_text):
+                            site.external+=1; hits.append(u)
+                    elif site.bfs and u not in self.seen:
+                        if site.queue.push(u, site.score(u, link_text, depth+1), depth+1, link_text): self.seen.add(u)
+                y=site.yields.setdefault(url_prefix(url), [0, 0]); y[0]+=1; y[1]+=bool(hits)
+                site.inflight-=1; self.inflight-=1
+                self._cv.notify_all()
+            timing("crawl.visit", site.host, time.perf_counter()-t)
+        for u in hits: self._emit(u)
+
+    def _emit(self, u:str):
+        host=urlparse(u).netloc.lower()
+        if any(h in host for h in SKIP_HOSTS): return
+        with self._cv:
+            if self._stop.is_set() or not self._emitted.add(u): return
+            if self.known and self.known(u):
+                self.known_skipped+=1; return
+            self.found.append(u)
+            if self.found_limit and len(self.found)>=self.found_limit: self._stop.set()
+        if self.on_found: self.on_found(u)
+
+def crawl_site_for_calls(seed:str, per_site_limit:int=20, follow_external:bool=False, external_cap:int=12,
+                         deadline:float=None):
+    # un solo host: sin la pausa de cortesía (como el BFS de antes, que pedía una página atrás de otra) y con el
+    # paralelismo acotado por HOST_MAX_INFLIGHT / la salud del host
+    return Crawler([seed], per_site_limit, budget=per_site_limit, external_cap=external_cap,
+                   follow_external=follow_external, deadline=deadline, min_delay=0.0).run()
+
+def _is_aggregator(seed:str):
+    host=urlparse(seed).netloc.replace("www.","")
+    return any(host.endswith(h) for h in AGGREGATOR_HOSTS)
+
+def curated_crawler(total_limit:int, intensity:int, on_found=None, deadline:float=None, known=None, since:float=None):
+    # mismo presupuesto total que antes (per × semillas), pero un host productivo puede usar hasta 2×per
+    per=max(8, (total_limit // max(1,len(CURATED_AR_SEEDS))) + (intensity//40))
+    return Crawler(CURATED_AR_SEEDS, per_site_limit=per*2, budget=per*len(CURATED_AR_SEEDS),
+                   external_cap=per//2, found_limit=total_limit, follow_external=_is_aggregator, on_found=on_found,
+                   deadline=deadline, known=known, since=since)
+
+def gather_curated_ar(total_limit:int, intensity:int):
+    return curated_crawler(total_limit, intensity).run()
+
+class Search:
+    # crawl y parse en paralelo: cada URL encontrada entra al pool de parse sin esperar al resto del crawl.
+    # Al iterar emite (registro|None, terminadas, encoladas). Con deadline (time.monotonic()) cada fetch
+    # recibe sólo el tiempo que queda y, al vencer, se cancela lo no empezado y se abandona lo que corre.
+    # workers = descargas simultáneas; extract_workers = procesos de extracción (None = EXTRACT_WORKERS).
+    # near: índice de casi-duplicados; cada registro entra antes de emitirse (near.cluster(rec) da su cluster) y
+    # el crawl no emite URLs que el índice ya conoce. El índice guarda firma y URLs de cada registro:
+    # dedup=False no arma índice (memoria constante, p. ej. cli batch --no-dedup) y near queda en None.
+    # revalidate: actualización forzada; lo cacheado antes de arrancar se revalida contra la red (ver fetch_bytes).
+    def __init__(self, intensity:int, workers:int=16, deadline:float=None, extract_workers:int=None, near=None,
+                 dedup:bool=True, revalidate:bool=False):
+        self.intensity=intensity; self.workers=workers; self.deadline=deadline
+        self.extract_workers=EXTRACT_WORKERS if extract_workers is None else extract_workers
+        self.near=(near_index() if near is None else near) if dedup else None
+        self.revalidate=revalidate
+        self.submitted=0; self.done=0; self.skipped=0; self.cut_off=0; self.timed_out=False
+        self.crawler=None; self.parse_busy=Gauge(); self.parse_queue=Gauge()
+        self._t0=None; self._t1=None; self._m0=None; self._h0=None
+
+    @property
+    def crawl_left(self):
+        return self.crawler.frontier_size() if self.crawler else 0
+
+    def diagnostics(self):
+        # tiempos por etapa/host de esta corrida + gauges de cola y pools (JSON-serializable)
+        c=self.crawler
+        return {
+            "elapsed_s": round((self._t1 or time.perf_counter())-self._t0, 3) if self._t0 else 0.0,
+            "pages": {"submitted": self.submitted, "done": self.done, "skipped": self.skipped,
+                      "cut_off": self.cut_off, "timed_out": self.timed_out,
+                      "crawled": c.fetched if c else 0, "found": len(c.found) if c else 0,
+                      "known_skipped": c.known_skipped if c else 0, "near_dups": self.near.merged if self.near is not None else None},
+            "gauges": {"crawl_queue": c.queue_depth.as_dict() if c else None,
+                       "crawl_busy": dict(c.busy.as_dict(), workers=c.workers) if c else None,
+                       "discovery": {s.host: {"entries": s.discovered[0], "emitted": s.discovered[1], "bfs": s.bfs}
+                                     for s in c.sites.values() if s.discovered} if c else None,
+                       "parse_queue": self.parse_queue.as_dict(),
+                       "parse_busy": dict(self.parse_busy.as_dict(), workers=self.workers),
+                       "extract_workers": self.extract_workers,
+                       "fetch": {"engine": FETCH_ENGINE, "aio_peak_inflight": aio_fetcher().peak if FETCH_ENGINE=="asyncio" else None}},
+            **stage_stats(since=self._m0),
+            "http": http_stats(since=self._h0),
+            "health": HEALTH.snapshot(),
+        }
+
+    def __iter__(self):
+        self._t0=time.perf_counter(); self._m0=snapshot(); self._h0=http_stats()
+        pending={}; lock=threading.Lock()   # future → URL pedida
+        since=time.time() if self.revalidate else None
+        ex=ThreadPoolExecutor(max_workers=self.workers); pool=extract_pool(self.extract_workers)
+        def submit(u):
+            with lock:
+                if self.timed_out: return
+                pending[ex.submit(parse_page, u, None, self.deadline, pool, since)]=u; self.submitted+=1
+        self.crawler=crawler=curated_crawler(total_limit=self.intensity, intensity=self.intensity,
+                                             on_found=submit, deadline=self.deadline, known=self.near.known if self.near is not None else None,
+                                             since=since)
+        th=threading.Thread(target=crawler.run, daemon=True); th.start()
+        try:
+            while True:
+                left=None if self.deadline is None else self.deadline-time.monotonic()
+                if left is not None and left<=0:
+                    self.timed_out=True; break
+                with lock: cur=set(pending)
+                self.parse_queue.add(len(cur)); self.parse_busy.add(sum(f.running() for f in cur))
+                if not cur:
+                    if not th.is_alive():
+                        with lock:
+                            if not pending: break
+                        continue
+                    th.join(0.1 if left is None else min(0.1, left)); continue
+                fin,_=wait(cur, timeout=0.2 if left is None else min(0.2, left), return_when=FIRST_COMPLETED)
+                for f in fin:
+                    with lock: u=pending.pop(f); queued=len(pending)
+                    self.done+=1
+                    try: rec=f.result()
+                    except Exception: rec=None
+                    if rec and self.near is not None: self.near.add(rec, u)
+                    yield rec, self.done, self.done+queued
+        finally:
+            crawler.stop()
+            with lock:
+                self.timed_out=self.timed_out or bool(pending)
+                for f in pending:
+                    if f.cancel(): self.skipped+=1
+                    elif not f.done(): self.cut_off+=1
+            if self.timed_out: self.cut_off+=crawler.inflight   # descargas del crawl abandonadas
+            # no esperamos a lo que sigue corriendo: cada fetch ya tiene el timeout acotado al deadline
+            ex.shutdown(wait=not self.timed_out, cancel_futures=True)
+            if not self.timed_out: th.join()
+            self._t1=time.perf_counter()
+            HEALTH.save(); ALIASES.save()
+
+# ───────── Dedup: fuerte (dominio + título) + casi-duplicados entre fuentes (neardup); mismo criterio para UI y store
+def norm_title(t): return re.sub(r"\W+"," ", (t or "").strip().lower())
+
+def record_key(r): return (r["source"], norm_title(r["title"]))
+
+def record_score(x):
+    s=0
+    if x.get("deadline"): s+=2
+    if x.get("links",{}).get("inscripcion"): s+=2
+    if x.get("links",{}).get("bases"): s+=1
+    return s
+
+def near_index():
+    # clusters por (fuente, título) exacto + casi-duplicados entre fuentes (la misma convocatoria en el museo y en los
+    # agregadores); en cada uno gana el mejor record_score
+    return NearDupIndex(record_score, boiler=(NO_SUMMARY, PDF_SUMMARY), key=record_key)
+
+def dedup_records(results):
+    near=near_index()
+    for r in results:
+        if r: near.add(r)
+    return near.best()
+
+# ───────── Export (CSV del modo batch, registro por registro; la UI exporta desde records.CallTable)
+def csv_row(c:dict):
+    return [
+        c["title"], c["url"], c["source"], c["type"], c["location"], c["scope"],
+        c["open_at"].strftime("%Y-%m-%d") if c.get("open_at") else "",
+        c["deadline"].strftime("%Y-%m-%d") if c.get("deadline") else "",
+        c["prize"], c["slots"], c["fee"], c["summary"]
+    ]
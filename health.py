@@ -0,0 +1,141 @@
+# Artify — salud por host: latencia/errores → concurrencia, timeout y circuito
+# Cada fetch a la red informa su resultado; el crawl pregunta cuántos requests simultáneos le da a cada host y
+# todos los fetch usan el timeout que corresponde. Tras varias fallas seguidas el circuito se abre (no se pide
+# nada a ese host por un rato, con backoff) y los slots quedan para los hosts sanos. Se guarda entre corridas.
+
+import os, time, sqlite3, threading
+from urllib.parse import urlparse
+
+import requests
+
+from cache import CACHE_DIR, CACHE_OFF
+
+HEALTH_PATH = os.path.join(CACHE_DIR, "health.sqlite")
+EWMA_ALPHA = 0.3          # peso de la última muestra
+FAST_TTFB = 1.0           # host rápido: puede tener el doble de requests simultáneos
+SLOW_TTFB = 3.0           # host lento: uno por vez y timeout recortado
+ERR_DEGRADED = 0.3        # tasa de error (EWMA) a partir de la cual el host está degradado
+MIN_SAMPLES = 3           # muestras antes de ajustar nada
+TIMEOUT_FACTOR = 4        # timeout ≈ 4 × TTFB típico del host
+MIN_TIMEOUT = 2.5
+OPEN_AFTER = 3            # fallas seguidas → circuito abierto
+OPEN_FOR = 60             # primer corte (s); se duplica en cada reapertura
+OPEN_MAX = 30*60
+FORGET_AFTER = 7*24*3600  # estado más viejo que esto no se carga
+
+class CircuitOpen(requests.ConnectionError):
+    pass   # el host tiene el circuito abierto: ni se intenta
+
+def host_key(url:str):
+    return (urlparse(url).hostname or "").lower().replace("www.","")
+
+class _Host:
+    __slots__=("ttfb","err","n","fails","open_until","backoff","probe","updated")
+    def __init__(self, ttfb=0.0, err=0.0, n=0, fails=0, open_until=0.0, backoff=0.0, updated=0.0):
+        self.ttfb=ttfb; self.err=err; self.n=n; self.fails=fails
+        self.open_until=open_until; self.backoff=backoff; self.updated=updated
+        self.probe=0.0   # half-open: cuándo salió el request de prueba
+
+    @property
+    def degraded(self):
+        return self.fails>0 or (self.n>=MIN_SAMPLES and (self.err>=ERR_DEGRADED or self.ttfb>=SLOW_TTFB))
+
+class HostHealth:
+    def __init__(self, path:str=None):
+        self.path=path; self.hosts={}; self._lock=threading.Lock()
+        self.opened=0; self.rejected=0
+        if path: self._load()
+
+    def _get(self, host:str):
+        h=self.hosts.get(host)
+        if h is None: h=self.hosts[host]=_Host()
+        return h
+
+    def allow(self, url:str):
+        # False con el circuito abierto; al vencer deja pasar un solo request de prueba (half-open)
+        now=time.time()
+        with self._lock:
+            h=self.hosts.get(host_key(url))
+            if h is None or h.open_until==0.0: return True
+            if now<h.open_until or (h.probe and now-h.probe<OPEN_FOR):
+                self.rejected+=1; return False
+            h.probe=now
+            return True
+
+    def is_open(self, url:str):
+        # como allow() pero sin gastar el request de prueba (para decidir si vale la pena encolar)
+        now=time.time()
+        with self._lock:
+            h=self.hosts.get(host_key(url))
+            return bool(h and h.open_until and (now<h.open_until or (h.probe and now-h.probe<OPEN_FOR)))
+
+    def limit(self, url:str, base:int):
+        # requests simultáneos para el host: base, 2×base si es rápido y sano, 1 si está degradado o en prueba
+        with self._lock:
+            h=self.hosts.get(host_key(url))
+            if h is None or h.n<MIN_SAMPLES and not h.fails: return base
+            if h.open_until or h.degraded: return 1
+            if h.ttfb<=FAST_TTFB and h.err<0.1: return base*2
+            return base
+
+    def timeout(self, url:str, base:float):
+        with self._lock:
+            h=self.hosts.get(host_key(url))
+            if h is None: return base
+            t=min(base, max(MIN_TIMEOUT, TIMEOUT_FACTOR*h.ttfb)) if h.n>=MIN_SAMPLES else base
+            return max(MIN_TIMEOUT, t/2) if h.degraded else t
+
+    def record(self, url:str, ok:bool, ttfb:float=None):
+        now=time.time()
+        with self._lock:
+            h=self._get(host_key(url)); h.updated=now; h.n+=1
+            h.err+=EWMA_ALPHA*((0.0 if ok else 1.0)-h.err)
+            if ttfb is not None: h.ttfb=ttfb if h.n==1 else h.ttfb+EWMA_ALPHA*(ttfb-h.ttfb)
+            if ok:
+                h.fails=0; h.open_until=0.0; h.backoff=0.0; h.probe=0.0
+                return
+            h.fails+=1
+            if now<h.open_until: return   # ya abierto: fallas de requests que salieron antes del corte
+            if h.fails>=OPEN_AFTER or h.open_until:   # una falla en half-open reabre con el doble
+                h.backoff=min(OPEN_MAX, h.backoff*2 if h.backoff else OPEN_FOR)
+                h.open_until=now+h.backoff; h.probe=0.0
+                self.opened+=1
+
+    def snapshot(self):
+        now=time.time()
+        with self._lock:
+            return {k: {"ttfb_ms": round(h.ttfb*1000), "error_rate": round(h.err, 2), "samples": h.n, "fails": h.fails,
+                        "open_s": round(max(0.0, h.open_until-now)), "degraded": h.degraded}
+                    for k, h in self.hosts.items()}
+
+    # ───────── persistencia (la próxima búsqueda arranca sabiendo qué hosts andan mal)
+    def _db(self):
+        d=os.path.dirname(self.path)
+        if d: os.makedirs(d, exist_ok=True)
+        db=sqlite3.connect(self.path, isolation_level=None, timeout=5)
+        db.execute("""CREATE TABLE IF NOT EXISTS hosts(host TEXT PRIMARY KEY, ttfb REAL, err REAL, n INTEGER,
+                      fails INTEGER, open_until REAL, backoff REAL, updated REAL)""")
+        return db
+
+    def _load(self):
+        try:
+            db=self._db()
+            try: rows=db.execute("SELECT * FROM hosts WHERE updated>?", (time.time()-FORGET_AFTER,)).fetchall()
+            finally: db.close()
+        except (OSError, sqlite3.Error):
+            self.path=None; return
+        for host, *vals in rows:
+            self.hosts[host]=_Host(*vals)
+
+    def save(self):
+        if not self.path: return
+        with self._lock:
+            rows=[(k, h.ttfb, h.err, h.n, h.fails, h.open_until, h.backoff, h.updated) for k, h in self.hosts.items()]
+        try:
+            db=self._db()
+            try: db.executemany("INSERT OR REPLACE INTO hosts VALUES (?,?,?,?,?,?,?,?)", rows)
+            finally: db.close()
+        except (OSError, sqlite3.Error):
+            pass
+
+HEALTH = HostHealth(None if CACHE_OFF else HEALTH_PATH)
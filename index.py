@@ -0,0 +1,102 @@
+# Artify — índice en memoria para filtrar/ordenar resultados sin recorrer todo
+# Invertido (sin tildes, por prefijo) sobre título/resumen/fuente + índices por tipo, ámbito, costo y fecha.
+# Va sobre una CallTable (records): search() devuelve posiciones de fila ya ordenadas, las tarjetas de la página
+# salen con table.rows(ids[a:b]) y el export con table.to_csv(ids) / to_ics(ids).
+
+import re, unicodedata
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+
+from records import CallTable
+
+_WORD = re.compile(r"\w+")
+NO_DEADLINE = 10**9   # ordinal "infinito": sin fecha va al final
+
+class _Marks(dict):
+    # codepoint → None si es una marca combinante (tilde, diéresis…); se arma a medida que aparecen caracteres
+    def __missing__(self, o):
+        v=self[o]=None if unicodedata.combining(chr(o)) else o
+        return v
+
+_MARKS = _Marks()
+
+def fold(s:str):
+    return unicodedata.normalize("NFKD", s or "").translate(_MARKS).lower()
+
+def tokens(s:str):
+    return _WORD.findall(fold(s))
+
+class CallIndex:
+    def __init__(self, records):
+        self.table=t=records if isinstance(records, CallTable) else CallTable(records)
+        n=len(t)
+        postings=defaultdict(lambda: array("I"))
+        title, summary, source=t.text["title"], t.text["summary"], t.getters["source"]
+        for i in range(n):
+            for tok in set(tokens(f"{title[i] or ''} {summary[i] or ''} {source(i) or ''}")):
+                postings[tok].append(i)
+        self.postings=dict(postings)
+        self.vocab=sorted(self.postings)
+        self.all=frozenset(range(n))
+
+        # categóricos: una pasada por la columna de códigos
+        def groups(field):
+            by=defaultdict(set); codes=t.codes[field]
+            for i in range(n): by[codes[i]].add(i)
+            return {t.values[field][c]: s for c, s in by.items()}
+        self.by_type=groups("type"); self.by_scope=groups("scope")
+        self.free=frozenset(i for i in range(n) if t.free[i])
+
+        # fecha límite: ordinales ordenados para rangos con bisect (sin fecha al final)
+        ords=[o or NO_DEADLINE for o in t.dates["deadline"]]
+        self.by_deadline=array("I", sorted(range(n), key=ords.__getitem__))
+        self.deadline_keys=array("i", (ords[i] for i in self.by_deadline))
+        self.no_deadline=frozenset(i for i in range(n) if ords[i]==NO_DEADLINE)
+        # órdenes precomputados para "Ordenar por": la fila en ese orden y su posición
+        self.order={"deadline": self.by_deadline, "title": array("I", sorted(range(n), key=lambda i: title[i] or ""))}
+        self.rank={}
+        for k, order in self.order.items():
+            r=array("I", bytes(4*n))
+            for pos, i in enumerate(order): r[i]=pos
+            self.rank[k]=r
+
+    def __len__(self): return len(self.table)
+
+    def _term(self, term:str):
+        # prefijo: "resid" → residencia, residencias, residente…
+        lo=bisect_left(self.vocab, term); hi=bisect_left(self.vocab, term+"\uffff")
+        out=set()
+        for t in self.vocab[lo:hi]: out.update(self.postings[t])
+        return out
+
+    def _date_range(self, desde=None, hasta=None):
+        # como antes: sin fecha límite no se descarta por rango
+        lo=bisect_left(self.deadline_keys, desde.toordinal()) if desde else 0
+        hi=bisect_right(self.deadline_keys, hasta.toordinal()) if hasta else bisect_left(self.deadline_keys, NO_DEADLINE)
+        return set(self.by_deadline[lo:hi]) | self.no_deadline
+
+    def search(self, query:str="", types=None, location:str="Todas", only_free:bool=False,
+               desde=None, hasta=None, order:str="deadline"):
+        # → posiciones de fila en el orden pedido
+        sets=[]
+        for term in tokens(query):
+            sets.append(self._term(term))
+        if types is not None:
+            sets.append(set().union(*(self.by_type.get(t, ()) for t in types)))
+        if location=="Argentina":       sets.append(self.by_scope.get("AR", set()))
+        elif location=="Internacional": sets.append(self.all-self.by_scope.get("AR", set()))
+        if only_free: sets.append(self.free)
+        if desde or hasta: sets.append(self._date_range(desde, hasta))
+        if not sets: return list(self.order[order])
+        sets.sort(key=len)   # intersectar desde el más chico
+        ids=set(sets[0])
+        for s in sets[1:]:
+            ids&=s
+            if not ids: break
+        # muchas filas: recorrer el orden precomputado sale más barato que ordenar
+        if 8*len(ids)>len(self.table): return [i for i in self.order[order] if i in ids]
+        return sorted(ids, key=self.rank[order].__getitem__)
+
+    def rows(self, ids):
+        return self.table.rows(ids)
@@ -0,0 +1,79 @@
+# Artify — instrumentación por etapa y por host
+# Tiempos acumulados (n / total / máximo) por etapa y por host, globales al proceso como los contadores de net;
+# una corrida toma una foto al empezar y pide la diferencia al final. Los gauges (cola, pools) son por corrida.
+# Los workers de extracción (procesos aparte) devuelven lo suyo con drain() y el padre lo suma con merge().
+
+import time, threading
+from contextlib import contextmanager
+
+_lock = threading.Lock()
+_stages = {}   # etapa → [n, total_s, max_s]
+_hosts = {}    # host → {etapa → [n, total_s, max_s]}
+
+def _host(h:str):
+    # mismo criterio que los contadores de net: hostname sin www. ni puerto
+    h=(h or "").lower()
+    if h.count(":")==1: h=h.split(":")[0]
+    return h.replace("www.","")
+
+def timing(stage:str, host:str, secs:float):
+    host=_host(host)
+    with _lock:
+        for acc in (_stages.setdefault(stage, [0, 0.0, 0.0]), _hosts.setdefault(host, {}).setdefault(stage, [0, 0.0, 0.0])):
+            acc[0]+=1; acc[1]+=secs
+            if secs>acc[2]: acc[2]=secs
+
+@contextmanager
+def timer(stage:str, host:str=""):
+    t=time.perf_counter()
+    try: yield
+    finally: timing(stage, host, time.perf_counter()-t)
+
+def drain():
+    # lo acumulado por host desde el último drain, y se vacía (lo llama un proceso worker para devolverlo al padre)
+    global _stages, _hosts
+    with _lock:
+        out={h: {k: tuple(v) for k, v in st.items()} for h, st in _hosts.items()}
+        _stages={}; _hosts={}
+    return out
+
+def merge(hosts:dict):
+    # suma lo que devolvió drain() en otro proceso
+    with _lock:
+        for host, st in hosts.items():
+            for stage, (n, total, mx) in st.items():
+                for acc in (_stages.setdefault(stage, [0, 0.0, 0.0]), _hosts.setdefault(host, {}).setdefault(stage, [0, 0.0, 0.0])):
+                    acc[0]+=n; acc[1]+=total
+                    if mx>acc[2]: acc[2]=mx
+
+def _diff(cur:dict, prev:dict):
+    out={}
+    for stage, (n, total, mx) in cur.items():
+        p=prev.get(stage, (0, 0.0, 0.0))
+        if n-p[0]: out[stage]={"n": n-p[0], "total_s": round(total-p[1], 4), "max_ms": round(mx*1000, 1)}
+    return out
+
+def snapshot():
+    with _lock:
+        return {"stages": {k: tuple(v) for k, v in _stages.items()},
+                "hosts": {h: {k: tuple(v) for k, v in st.items()} for h, st in _hosts.items()}}
+
+def stage_stats(since:dict=None):
+    # since = snapshot() de antes; el máximo es el histórico del proceso (no se puede restar)
+    cur=snapshot(); since=since or {}
+    prev_hosts=since.get("hosts", {})
+    hosts={}
+    for h, st in cur["hosts"].items():
+        d=_diff(st, prev_hosts.get(h, {}))
+        if d: hosts[h]=d
+    return {"stages": _diff(cur["stages"], since.get("stages", {})), "hosts": hosts}
+
+class Gauge:
+    # muestras de un valor instantáneo (profundidad de cola, workers ocupados)
+    __slots__=("n","total","max","last")
+    def __init__(self): self.n=0; self.total=0.0; self.max=0; self.last=0
+    def add(self, v):
+        self.n+=1; self.total+=v; self.last=v
+        if v>self.max: self.max=v
+    def as_dict(self):
+        return {"samples": self.n, "mean": round(self.total/self.n, 2) if self.n else 0.0, "max": self.max, "last": self.last}
@@ -0,0 +1,132 @@
+# Artify — casi-duplicados entre fuentes (MinHash + LSH)
+# La misma convocatoria aparece en el sitio del museo y en 2-3 agregadores con títulos apenas distintos: la clave
+# exacta (fuente, título) no los junta. Cada registro se reduce a shingles (palabras del título y pares de palabras
+# de título + resumen, sin tildes ni palabras vacías) y a una firma MinHash; las bandas de la firma dan candidatos
+# en O(1) por registro y se confirma con el Jaccard exacto. Fechas límite o números del título distintos (año,
+# edición) = convocatorias distintas, aunque el texto se parezca. Cada cluster se queda con el mejor registro según
+# el score que le pasen.
+
+from zlib import crc32
+from random import Random
+
+from index import tokens
+from canon import url_key, canon_key, SeenSet
+
+NUM_PERM = 32             # largo de la firma
+BANDS = 16                # 16 bandas de 2: candidato con p≈0.8 a Jaccard 0.3, casi seguro desde 0.5
+JACCARD_MIN = 0.5         # confirmación sobre los shingles reales
+JACCARD_SAME_DEADLINE = 0.3   # con la misma fecha límite alcanza con menos texto en común
+MIN_SHINGLES = 4          # con menos no hay con qué comparar
+MIN_TITLE_WORDS = 2       # "Convocatorias", "Inicio": páginas genéricas, no una convocatoria puntual
+MAX_BUCKET = 64           # candidatos por banda: textos de plantilla no vuelven cuadrático el índice
+STOP = frozenset("de del la las el los y e en a al para por con un una que se su sus o u lo es".split())
+GENERIC = frozenset("convocatoria convocatorias abierta abiertas inicio home noticias nota".split())
+
+_ROWS = NUM_PERM//BANDS
+_PRIME = (1<<61)-1
+_rnd = Random(23)
+_PERMS = tuple((_rnd.randrange(1, _PRIME), _rnd.randrange(_PRIME)) for _ in range(NUM_PERM))   # h → (a·h+b) mod p
+
+def shingles(rec:dict, boiler=()):
+    # palabras del título (lo que más se repite entre fuentes) + pares de palabras de título y resumen.
+    # boiler: resúmenes genéricos ("poca descripción") que no dicen nada de la convocatoria.
+    # Sin un título propio (MIN_TITLE_WORDS) → vacío: el registro no se compara con nada.
+    title=[w for w in tokens(rec.get("title") or "") if w not in STOP]
+    if sum(w not in GENERIC for w in title)<MIN_TITLE_WORDS: return frozenset()
+    summary=rec.get("summary") or ""
+    words=title+[w for w in tokens("" if summary in boiler else summary) if w not in STOP]
+    return frozenset(title).union(f"{a} {b}" for a, b in zip(words, words[1:]))
+
+def title_numbers(rec:dict):
+    return frozenset(w for w in tokens(rec.get("title") or "") if w.isdigit())
+
+def signature(sh:frozenset):
+    hs=[crc32(s.encode("utf-8")) for s in sh] or [0]
+    return tuple(min((a*h+b)%_PRIME for h in hs) for a, b in _PERMS)
+
+def jaccard(a:frozenset, b:frozenset):
+    if not a or not b: return 0.0
+    return len(a&b)/len(a|b)
+
+class NearDupIndex:
+    # add(rec) → id de cluster (estable: un registro nuevo se suma al cluster más parecido, los clusters no se
+    # fusionan). best() = un registro por cluster, el de mayor score (empate: el primero que llegó).
+    # key(rec): clave exacta (fuente, título) que va siempre al mismo cluster, se parezca o no el texto.
+    def __init__(self, score=None, threshold:float=JACCARD_MIN, same_deadline:float=JACCARD_SAME_DEADLINE, boiler=(),
+                 key=None):
+        self.score=score or (lambda r: 0); self.threshold=threshold; self.same_deadline=same_deadline
+        self.boiler=frozenset(boiler); self.key=key; self.keys={}
+        self.members=[]       # por cluster: [shingles]
+        self.winner=[]        # por cluster: mejor registro hasta ahora
+        self.deadlines=[]     # por cluster: fecha límite (la primera que apareció; None si ninguno tiene)
+        self.numbers=[]       # por cluster: números del título (ídem)
+        self.buckets={}       # (banda, valores) → [cluster]
+        self.urls={}          # canon_key → cluster (URL pedida y final de cada registro)
+        self.dupes=SeenSet()  # duplicados de corridas anteriores (seed)
+        self.merged=0
+
+    def __len__(self): return len(self.winner)
+
+    def _match(self, sh:frozenset, sig:tuple, deadline, nums:frozenset):
+        # el cluster con el miembro más parecido. Otra fecha límite u otros números en el título del cluster → nunca
+        # (aunque el parecido sea con un miembro sin fecha: si no, un repost sin fecha puentea dos ediciones);
+        # la misma fecha baja la vara.
+        best=None; best_j=0.0
+        seen=set()
+        for b in range(BANDS):
+            for c in self.buckets.get((b, sig[b*_ROWS:(b+1)*_ROWS]), ())[-MAX_BUCKET:]:
+                if c in seen: continue
+                seen.add(c)
+                cdl=self.deadlines[c]; cnums=self.numbers[c]
+                if (deadline and cdl and deadline!=cdl) or (nums and cnums and nums!=cnums): continue
+                need=self.same_deadline if deadline and deadline==cdl else self.threshold
+                for msh in self.members[c]:
+                    j=jaccard(sh, msh)
+                    if j>best_j and j>=need: best, best_j=c, j
+        return best
+
+    def add(self, rec:dict, url:str=None):
+        # url: la URL pedida, si no es la final del registro (redirect)
+        sh=shingles(rec, self.boiler); dl=rec.get("deadline"); nums=title_numbers(rec)
+        sig=signature(sh) if len(sh)>=MIN_SHINGLES else None   # sin firma no entra a las bandas: queda solo
+        k=self.key(rec) if self.key else None
+        c=self.urls.get(canon_key(rec.get("url")))
+        if c is None: c=self.keys.get(k)
+        if c is None and sig: c=self._match(sh, sig, dl, nums)
+        if c is None:
+            c=len(self.winner); self.members.append([]); self.winner.append(rec)
+            self.deadlines.append(dl); self.numbers.append(nums)
+        else:
+            self.merged+=1
+            if self.score(rec)>self.score(self.winner[c]): self.winner[c]=rec
+            if not self.deadlines[c]: self.deadlines[c]=dl
+            if not self.numbers[c]: self.numbers[c]=nums
+        for u in (url, rec.get("url")):
+            if u: self.urls.setdefault(canon_key(u), c)
+        if k is not None: self.keys.setdefault(k, c)
+        if sig:
+            self.members[c].append(sh)
+            for b in range(BANDS):
+                lst=self.buckets.setdefault((b, sig[b*_ROWS:(b+1)*_ROWS]), [])
+                if c not in lst: lst.append(c)
+        return c
+
+    def cluster(self, rec:dict):
+        # id de cluster de un registro ya agregado (si después se aprendió un alias para su URL, por la clave sin alias)
+        u=rec.get("url"); c=self.urls.get(canon_key(u))
+        return self.urls.get(url_key(u)) if c is None else c
+
+    def seed(self, records):
+        # registros de corridas anteriores (el store): los que pierden en su cluster son copias de otra fuente y no
+        # se vuelven a parsear. Los ganadores sí (pueden haber cambiado).
+        tmp=NearDupIndex(self.score, self.threshold, self.same_deadline, self.boiler, self.key)
+        for r in records: tmp.add(r)
+        win={id(r) for r in tmp.winner}
+        self.dupes.update(r.get("url") for r in records if id(r) not in win)
+
+    def known(self, url:str):
+        # ya hay registro para esta URL (o una variante: www., https, barra final, tracking, alias) o es un duplicado conocido
+        return canon_key(url) in self.urls or url in self.dupes
+
+    def best(self):
+        return list(self.winner)
@@ -0,0 +1,221 @@
+# Artify — capa HTTP compartida
+# Sesiones con keep-alive (una por hilo, pools compartidos), tamaño de pool por host,
+# política de reintentos/backoff configurable y contadores de reuso de conexiones.
+
+import time, threading
+from collections import OrderedDict
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+from metrics import timing
+from canon import url_key
+
+# ───────── Política por defecto (se cambia con configure_http)
+POOL_HOSTS = 32          # hosts con pool abierto a la vez
+POOL_PER_HOST = 8        # conexiones keep-alive por host
+POOL_BLOCK = False       # True → el pool también limita la concurrencia por host
+HOST_POOLS = {           # overrides por host (sin www.)
+    "cultura.gob.ar": 4,
+    "museosiivori.buenosaires.gob.ar": 2,
+}
+RETRY_TOTAL = 2
+RETRY_BACKOFF = 0.3
+RETRY_STATUS = (429, 502, 503, 504)
+
+class DeadlineExceeded(requests.Timeout):
+    pass   # se acabó el tiempo de la búsqueda antes/durante el fetch
+
+class ContentRejected(requests.RequestException):
+    pass   # la respuesta es un binario que no sirve (imagen, zip, video…): se cortó en el primer chunk
+
+# ───────── Contadores (requests vs. conexiones nuevas = handshakes)
+_stats_lock = threading.Lock()
+_stats = {"requests": 0, "connections": 0, "hosts": {}}
+
+def _bump(host:str, field:str):
+    host = (host or "").lower().replace("www.","")
+    with _stats_lock:
+        _stats[field] += 1
+        h = _stats["hosts"].setdefault(host, {"requests": 0, "connections": 0})
+        h[field] += 1
+
+# se cuenta en connect(): también cubre reconexiones de un socket que el server cerró.
+# _new_conn = DNS + TCP (urllib3 resuelve y conecta en la misma llamada); en https el resto de connect() es TLS.
+# Por un proxy https la conexión es al proxy + CONNECT al host (_tunnel): las dos van a fetch.connect y todo se anota
+# al host de destino, como hace aiohttp con sus trace hooks; en http plano por proxy es la conexión al proxy.
+class _TimedConnect:
+    def _origin(self): return self._tunnel_host or self.host
+
+    def _new_conn(self):
+        t=time.perf_counter()
+        try: return super()._new_conn()
+        finally:
+            self._conn_s=time.perf_counter()-t
+            if not self._tunnel_host: timing("fetch.connect", self.host, self._conn_s)
+
+    def _tunnel(self):
+        t=time.perf_counter()
+        try: return super()._tunnel()
+        finally:
+            self._conn_s+=time.perf_counter()-t
+            timing("fetch.connect", self._tunnel_host, self._conn_s)
+
+class _CountingHTTPConnection(_TimedConnect, HTTPConnection):
+    def connect(self):
+        _bump(self._origin(), "connections")
+        return super().connect()
+
+class _CountingHTTPSConnection(_TimedConnect, HTTPSConnection):
+    def connect(self):
+        _bump(self._origin(), "connections")
+        t=time.perf_counter(); self._conn_s=0.0
+        super().connect()
+        timing("fetch.tls", self._origin(), time.perf_counter()-t-self._conn_s)
+
+class _CountingHTTPPool(HTTPConnectionPool):
+    ConnectionCls = _CountingHTTPConnection
+
+class _CountingHTTPSPool(HTTPSConnectionPool):
+    ConnectionCls = _CountingHTTPSConnection
+
+_COUNTING_POOLS = {"http": _CountingHTTPPool, "https": _CountingHTTPSPool}
+
+class _PooledAdapter(HTTPAdapter):
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = _COUNTING_POOLS
+
+    def proxy_manager_for(self, proxy, **proxy_kwargs):
+        # con HTTP(S)_PROXY requests arma otro manager (uno por proxy) con los pools de fábrica: sin esto esas
+        # conexiones no se cuentan ni se miden. En http plano la conexión es al proxy (un pool compartido por todos los
+        # hosts), en https es el túnel al host. SOCKS usa sus propios pools: no se cuentan.
+        pm=super().proxy_manager_for(proxy, **proxy_kwargs)
+        if not proxy.lower().startswith("socks"): pm.pool_classes_by_scheme = _COUNTING_POOLS
+        return pm
+
+def _retry():
+    return Retry(total=RETRY_TOTAL, connect=RETRY_TOTAL, read=1, status=RETRY_TOTAL,
+                 backoff_factor=RETRY_BACKOFF, status_forcelist=RETRY_STATUS,
+                 allowed_methods=frozenset({"GET", "HEAD"}), raise_on_status=False,
+                 respect_retry_after_header=True)
+
+def _adapter(size:int):
+    return _PooledAdapter(pool_connections=POOL_HOSTS, pool_maxsize=size, pool_block=POOL_BLOCK, max_retries=_retry())
+
+# ───────── Adaptadores compartidos entre hilos; la Session es por hilo (cookies/headers no se pisan)
+_adapters_lock = threading.Lock()
+_generation = 0
+_default_adapter = None
+_host_adapters = {}   # prefijo "https://host/" → adapter
+_local = threading.local()
+
+def _build_adapters():
+    global _default_adapter, _host_adapters, _generation
+    _default_adapter = _adapter(POOL_PER_HOST)
+    _host_adapters = {}
+    for host, size in HOST_POOLS.items():
+        ad = _adapter(size)
+        for h in (host, "www."+host):
+            for scheme in ("https://", "http://"):
+                _host_adapters[f"{scheme}{h}/"] = ad
+    _generation += 1
+
+def configure_http(pool_per_host:int=None, host_pools:dict=None, retries:int=None,
+                   backoff:float=None, retry_status=None, pool_block:bool=None):
+    global POOL_PER_HOST, HOST_POOLS, RETRY_TOTAL, RETRY_BACKOFF, RETRY_STATUS, POOL_BLOCK
+    with _adapters_lock:
+        if pool_per_host is not None: POOL_PER_HOST = pool_per_host
+        if host_pools is not None:    HOST_POOLS = dict(host_pools)
+        if retries is not None:       RETRY_TOTAL = retries
+        if backoff is not None:       RETRY_BACKOFF = backoff
+        if retry_status is not None:  RETRY_STATUS = tuple(retry_status)
+        if pool_block is not None:    POOL_BLOCK = pool_block
+        _build_adapters()
+
+def session():
+    s = getattr(_local, "session", None)
+    if s is not None and getattr(_local, "generation", -1) == _generation:
+        return s
+    with _adapters_lock:
+        if _default_adapter is None: _build_adapters()
+        s = requests.Session()
+        s.mount("https://", _default_adapter)
+        s.mount("http://", _default_adapter)
+        for prefix, ad in _host_adapters.items():
+            s.mount(prefix, ad)
+        _local.session = s; _local.generation = _generation
+    return s
+
+def http_get(url:str, headers:dict=None, timeout=None, stream:bool=True):
+    _bump(urlparse(url).hostname, "requests")
+    return session().get(url, headers=headers, timeout=timeout, allow_redirects=True, stream=stream)
+
+def http_stats(since:dict=None):
+    with _stats_lock:
+        out = {"requests": _stats["requests"], "connections": _stats["connections"],
+               "hosts": {h: dict(v) for h, v in _stats["hosts"].items()}}
+    if since:
+        out["requests"] -= since.get("requests", 0)
+        out["connections"] -= since.get("connections", 0)
+        prev = since.get("hosts", {})
+        hosts = {}
+        for h, v in out["hosts"].items():
+            p = prev.get(h, {})
+            d = {"requests": v["requests"]-p.get("requests", 0), "connections": v["connections"]-p.get("connections", 0)}
+            if d["requests"] or d["connections"]: hosts[h] = d
+        out["hosts"] = hosts
+    out["reused"] = max(0, out["requests"] - out["connections"])
+    return out
+
+# ───────── Páginas ya descargadas (el crawl las deja, el parse las toma sin volver a la red)
+
+PAGE_STORE_MAX_BYTES = 48*1024*1024
+PAGE_STORE_MAX_ITEM = 4*1024*1024
+PAGE_STORE_TTL = 2*3600
+
+class PageStore:
+    def __init__(self, max_bytes:int=PAGE_STORE_MAX_BYTES, max_item:int=PAGE_STORE_MAX_ITEM, ttl:float=PAGE_STORE_TTL):
+        self.max_bytes=max_bytes; self.max_item=max_item; self.ttl=ttl
+        self._items=OrderedDict()   # url_key → (t, data, ct, final): http/https, www., barra final → la misma
+        self._bytes=0; self._lock=threading.Lock()
+        self.hits=0; self.misses=0
+
+    def put(self, url:str, data:bytes, ct:str, final:str):
+        if len(data) > self.max_item: return
+        with self._lock:
+            for key in {url_key(url), url_key(final)}:
+                old=self._items.pop(key, None)
+                if old: self._bytes-=len(old[1])
+                self._items[key]=(time.time(), data, ct, final)
+                self._bytes+=len(data)
+            while self._bytes > self.max_bytes and self._items:
+                _, old=self._items.popitem(last=False)
+                self._bytes-=len(old[1])
+
+    def get(self, url:str, since:float=None):
+        # since: sólo lo guardado desde entonces (actualización forzada: lo de una corrida anterior no sirve)
+        key=url_key(url)
+        with self._lock:
+            it=self._items.get(key)
+            if it and since and it[0]<since:
+                self.misses+=1; return None
+            if it and time.time()-it[0] <= self.ttl:
+                self._items.move_to_end(key); self.hits+=1
+                return it[1], it[2], it[3]
+            if it:
+                self._items.pop(key); self._bytes-=len(it[1])
+            self.misses+=1
+            return None
+
+    def __contains__(self, url:str):
+        with self._lock: return url_key(url) in self._items
+
+    def __len__(self):
+        with self._lock: return len(self._items)
+
+PAGES = PageStore()
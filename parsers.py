@@ -0,0 +1,73 @@
+# Artify — backends de parseo HTML
+# Los extractores usan BeautifulSoup con html.parser: con lxml como tree builder la extracción completa no sale más
+# rápida (el costo está en los extractores, no en el árbol) y el HTML roto se repara distinto (títulos, resúmenes y
+# links cambian); ARTIFY_SOUP=lxml lo activa igual. El crawl sólo necesita título, texto y links: para eso hay un
+# "outline" que ni arma el árbol de bs4, con selectolax (lexbor) > lxml > html.parser de la stdlib, según lo que haya.
+
+import os
+from html.parser import HTMLParser
+
+try: import lxml.html as _lxml_html
+except ImportError: _lxml_html = None
+try: from selectolax.lexbor import LexborHTMLParser as _Lexbor
+except ImportError: _Lexbor = None
+
+SOUP_FEATURES = os.environ.get("ARTIFY_SOUP") or "html.parser"
+OUTLINE_BACKEND = os.environ.get("ARTIFY_OUTLINE") or ("selectolax" if _Lexbor else "lxml" if _lxml_html else "stdlib")
+HIDDEN = ("script", "style", "template")   # get_text() de bs4 no los incluye: acá tampoco
+
+class Outline:
+    # title/text crudos (como soup.title.get_text() / soup.get_text(" ")), links = [(href, texto del link)]
+    __slots__=("title","text","links")
+    def __init__(self, title:str, text:str, links:list):
+        self.title=title; self.text=text; self.links=links
+
+def _outline_selectolax(html:str):
+    tree=_Lexbor(html)
+    t=tree.css_first("title")
+    title=t.text() if t else ""
+    links=[(a.attributes.get("href") or "", a.text(separator=" ")) for a in tree.css("a[href]")]
+    tree.strip_tags(list(HIDDEN))
+    return Outline(title, tree.root.text(separator=" ") if tree.root else "", links)
+
+def _outline_lxml(html:str):
+    try: doc=_lxml_html.document_fromstring(html)
+    except (ValueError, _lxml_html.etree.ParserError): return Outline("", "", [])
+    t=doc.find(".//title")
+    title=t.text_content() if t is not None else ""
+    links=[(a.get("href") or "", " ".join(a.xpath(".//text()"))) for a in doc.iter("a") if a.get("href") is not None]
+    text=" ".join(doc.xpath("//text()[not(ancestor::script) and not(ancestor::style) and not(ancestor::template)]"))
+    return Outline(title, text, links)
+
+class _Scanner(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.title=None; self.parts=[]; self.links=[]
+        self._hidden=0; self._in_title=False; self._title=[]; self._a=[]   # links abiertos: [href, textos]
+    def handle_starttag(self, tag, attrs):
+        if tag in HIDDEN: self._hidden+=1
+        elif tag=="title" and self.title is None: self._in_title=True
+        elif tag=="a":
+            href=dict(attrs).get("href")
+            if href is not None:   # en orden de aparición, como select("a[href]")
+                self._a.append([href, []]); self.links.append(self._a[-1])
+    def handle_endtag(self, tag):
+        if tag in HIDDEN: self._hidden=max(0, self._hidden-1)
+        elif tag=="title" and self._in_title: self._in_title=False; self.title="".join(self._title)
+        elif tag=="a" and self._a: self._a.pop()
+    def handle_data(self, data):
+        if self._hidden: return
+        self.parts.append(data)
+        if self._in_title: self._title.append(data)
+        for a in self._a: a[1].append(data)
+
+def _outline_stdlib(html:str):
+    p=_Scanner()
+    try: p.feed(html); p.close()
+    except Exception: pass
+    return Outline(p.title or "".join(p._title), " ".join(p.parts), [(href, " ".join(parts)) for href, parts in p.links])
+
+_OUTLINE = {"selectolax": _outline_selectolax, "lxml": _outline_lxml, "stdlib": _outline_stdlib}
+
+def outline(html:str, backend:str=None):
+    return _OUTLINE[backend or OUTLINE_BACKEND](html or "")
@@ -0,0 +1,56 @@
+# Artify — texto de PDFs (bases / reglamentos)
+# Muchas convocatorias publican las fechas sólo en el PDF de bases. Se leen las primeras páginas nomás (ahí están
+# fechas, premio y requisitos) y el texto se corta en PDF_MAX_CHARS: memoria y tiempo acotados aunque el PDF sea
+# enorme. pypdf es opcional: sin él, available() da False y el PDF queda como antes (registro con el link).
+
+import re, logging
+from io import BytesIO
+
+try: import pypdf
+except ImportError: pypdf = None
+
+PDF_MAX_PAGES = 6
+PDF_MAX_CHARS = 40000
+BACKEND = f"pypdf {pypdf.__version__}" if pypdf else None   # entra en la versión del extractor
+
+if pypdf: logging.getLogger("pypdf").setLevel(logging.ERROR)   # PDFs rotos/truncados: avisa por cada objeto
+
+_CATALOG = re.compile(rb"(\d+)\s+(\d+)\s+obj\s*<<(?:(?!>>).){0,200}?/Type\s*/Catalog", re.S)
+
+def available():
+    return pypdf is not None
+
+def _meta_title(reader):
+    try: t=(reader.metadata or {}).get("/Title")
+    except Exception: return ""
+    t=str(t or "").strip()
+    # "Microsoft Word - bases.docx", "untitled", nombres de archivo: no sirven de título
+    low=t.lower()
+    if low.startswith(("microsoft", "untitled", "sin título")) or low.endswith((".doc", ".docx", ".pdf", ".indd")): return ""
+    return t
+
+def _close_truncated(data:bytes):
+    # descarga cortada en BYTE_CAPS: sin xref ni trailer al final. Se cierra el objeto a medias y se agrega un
+    # trailer que apunta al catálogo; pypdf (no estricto) reconstruye el xref recorriendo los objetos. Si el catálogo
+    # está dentro de un object stream no se encuentra y queda como vino.
+    if b"%%EOF" in data[-2048:]: return data
+    m=_CATALOG.search(data)
+    if not m: return data
+    return data+b"\nendstream\nendobj\ntrailer\n<< /Root %s %s R >>\nstartxref\n0\n%%%%EOF\n" % (m.group(1), m.group(2))
+
+def pdf_text(data:bytes, max_pages:int=None, max_chars:int=None):
+    # → (título de los metadatos, texto de las primeras páginas); ("", "") si no se puede leer
+    if pypdf is None or not data: return "", ""
+    max_pages=max_pages or PDF_MAX_PAGES; max_chars=max_chars or PDF_MAX_CHARS
+    try:
+        reader=pypdf.PdfReader(BytesIO(_close_truncated(data)), strict=False)
+        if reader.is_encrypted and not reader.decrypt(""): return "", ""
+        parts=[]; n=0
+        for i, page in enumerate(reader.pages):
+            if i>=max_pages or n>=max_chars: break
+            try: t=page.extract_text() or ""
+            except Exception: continue   # una página rota no tira el resto
+            parts.append(t); n+=len(t)+1
+        return _meta_title(reader), " ".join(parts)[:max_chars]
+    except Exception:
+        return "", ""
@@ -0,0 +1,145 @@
+# Artify — registros compactos: layout plano, fila con __slots__ y tabla columnar de resultados
+# Un registro suelto es un dict (~15 claves + links) y así sale del extractor y va al store. Para miles de resultados
+# en memoria (índice de la UI) CallTable guarda una columna por campo: los categóricos ("—", "Convocatorias", "UNK",
+# dominios, montos repetidos) como códigos en un array + la lista de valores, las fechas como ordinal (0 = sin fecha),
+# free en un bytearray y el texto libre en listas. Call es una fila (tabla + posición) que se lee como el dict de
+# siempre (r["title"], r.get("links"), dict(r)): tarjetas, dedup y export no distinguen. CSV e ICS salen directo de
+# las columnas.
+
+import io, csv
+from array import array
+from datetime import date
+from functools import lru_cache
+
+RECORD_FIELDS = ("source","title","url","open_at","deadline","type","location","scope","prize","slots","fee","free","summary")
+DATE_FIELDS = ("open_at","deadline")
+LINK_FIELDS = ("principal","bases","inscripcion")
+CATEGORICAL = ("source","type","location","scope","prize","slots","fee")
+TEXT_FIELDS = ("title","url","summary")
+CSV_HEADER = ["titulo","url","fuente","categoria","ubicacion","ambito","abre","cierra","premio","cupos","fee","resumen"]
+ICS_HEAD = ["BEGIN:VCALENDAR","VERSION:2.0","PRODID:-//Artify//Convocatorias//ES"]
+_POS = {f: k for k, f in enumerate(RECORD_FIELDS)}   # campo → posición en la tupla de pack_record
+
+def pack_record(rec:dict):
+    # dict → tupla plana (fechas como ordinal): lo que viaja del worker al proceso principal
+    if rec is None: return None
+    links=rec.get("links") or {}
+    return (*((v.toordinal() if v and k in DATE_FIELDS else v) for k, v in ((k, rec.get(k)) for k in RECORD_FIELDS)),
+            *(links.get(k) for k in LINK_FIELDS), tuple(links.get("pdfs") or ()))
+
+def unpack_record(t:tuple):
+    if t is None: return None
+    n=len(RECORD_FIELDS); m=n+len(LINK_FIELDS)
+    rec={k: (date.fromordinal(v) if v and k in DATE_FIELDS else v) for k, v in zip(RECORD_FIELDS, t[:n])}
+    rec["links"]={**dict(zip(LINK_FIELDS, t[n:m])), "pdfs": list(t[m])}
+    return rec
+
+@lru_cache(maxsize=4096)
+def _day(o:int, fmt:str):
+    # ordinal → texto; pocas fechas distintas entre miles de convocatorias
+    return date.fromordinal(o).strftime(fmt) if o else ""
+
+class Call:
+    # una fila de CallTable; se lee como el dict del registro
+    __slots__=("t","i")
+    def __init__(self, t, i:int): self.t=t; self.i=i
+    def __getitem__(self, k): return self.t.value(self.i, k)
+    def get(self, k, default=None):
+        try: return self.t.value(self.i, k)
+        except KeyError: return default
+    def __contains__(self, k): return k in self.t.getters
+    def keys(self): return self.t.getters.keys()
+    def to_dict(self): return {k: self.t.value(self.i, k) for k in self.t.getters}
+    def __repr__(self): return f"Call({self.t.value(self.i, 'title')!r}, {self.t.value(self.i, 'url')!r})"
+
+class CallTable:
+    def __init__(self, records=()):
+        self.codes={f: array("I") for f in CATEGORICAL}   # código por fila
+        self.values={f: [] for f in CATEGORICAL}          # código → valor
+        self._code={f: {} for f in CATEGORICAL}           # valor → código
+        self.dates={f: array("i") for f in DATE_FIELDS}   # ordinal, 0 = sin fecha
+        self.free=bytearray()
+        self.text={f: [] for f in TEXT_FIELDS}
+        self.links={f: [] for f in LINK_FIELDS}; self.pdfs=[]
+        self._strings={}   # los links se repiten (página institucional, formulario): un solo objeto por texto
+        self._exports={}   # (formato, filas) → texto: los reruns con el mismo filtro no vuelven a serializar
+        g={**{f: (lambda i, c=self.codes[f], v=self.values[f]: v[c[i]]) for f in CATEGORICAL},
+           **{f: (lambda i, d=self.dates[f]: date.fromordinal(d[i]) if d[i] else None) for f in DATE_FIELDS},
+           **{f: self.text[f].__getitem__ for f in TEXT_FIELDS},
+           "free": lambda i: bool(self.free[i]),
+           "links": lambda i: {**{f: self.links[f][i] for f in LINK_FIELDS}, "pdfs": list(self.pdfs[i])}}
+        self.getters={k: g[k] for k in (*RECORD_FIELDS, "links")}   # mismo orden de claves que el dict
+        self.extend(records)
+
+    def __len__(self): return len(self.free)
+
+    def append(self, rec):
+        # dict, Call o la tupla de pack_record
+        t=rec.t.packed(rec.i) if isinstance(rec, Call) else rec if isinstance(rec, tuple) else pack_record(rec)
+        for f in CATEGORICAL:
+            v=t[_POS[f]]; m=self._code[f]; c=m.get(v)
+            if c is None: c=m[v]=len(self.values[f]); self.values[f].append(v)
+            self.codes[f].append(c)
+        for f in DATE_FIELDS: self.dates[f].append(t[_POS[f]] or 0)
+        for f in TEXT_FIELDS: self.text[f].append(t[_POS[f]])
+        self.free.append(bool(t[_POS["free"]]))
+        strings=self._strings; n=len(RECORD_FIELDS)
+        for f, v in zip(LINK_FIELDS, t[n:]): self.links[f].append(v if v is None else strings.setdefault(v, v))
+        self.pdfs.append(tuple(strings.setdefault(u, u) for u in t[-1]) if t[-1] else ())
+        self._exports.clear()
+        return len(self.free)-1
+
+    def extend(self, records):
+        for r in records:
+            if r is not None: self.append(r)
+
+    def value(self, i:int, k:str): return self.getters[k](i)
+    def row(self, i:int): return Call(self, i)
+    def rows(self, ids=None): return [Call(self, i) for i in (range(len(self)) if ids is None else ids)]
+
+    def packed(self, i:int):
+        return (*(self.value(i, f) if f not in DATE_FIELDS else self.dates[f][i] or None for f in RECORD_FIELDS),
+                *(self.links[f][i] for f in LINK_FIELDS), self.pdfs[i])
+
+    def code(self, field:str, value):
+        # código del valor en la columna categórica (None si ninguna fila lo tiene)
+        return self._code[field].get(value)
+
+    # ───────── export: directo de las columnas, memo por (formato, filas)
+    def _memo(self, kind:str, ids, build):
+        key=(kind, tuple(ids))
+        out=self._exports.get(key)
+        if out is None:
+            if len(self._exports)>=4: self._exports.pop(next(iter(self._exports)))
+            out=self._exports[key]=build(key[1])
+        return out
+
+    def csv_rows(self, ids):
+        # las columnas directo, sin pasar por los getters (ida y vuelta por fila)
+        c=self.codes; v=self.values; op=self.dates["open_at"]; dl=self.dates["deadline"]
+        title, url, summ=self.text["title"], self.text["url"], self.text["summary"]
+        (cs, vs), (ct, vt), (cl, vl), (cc, vc), (cp, vp), (cn, vn), (cf, vf)=((c[f], v[f]) for f in CATEGORICAL)
+        for i in ids:
+            yield [title[i], url[i], vs[cs[i]], vt[ct[i]], vl[cl[i]], vc[cc[i]], _day(op[i], "%Y-%m-%d"),
+                   _day(dl[i], "%Y-%m-%d"), vp[cp[i]], vn[cn[i]], vf[cf[i]], summ[i]]
+
+    def to_csv(self, ids):
+        def build(ids):
+            buf=io.StringIO(); w=csv.writer(buf)
+            w.writerow(CSV_HEADER); w.writerows(self.csv_rows(ids))
+            return buf.getvalue()
+        return self._memo("csv", ids, build)
+
+    def to_ics(self, ids):
+        # un evento de día completo por fecha límite (sin fecha no entra)
+        def build(ids):
+            out=list(ICS_HEAD); dl=self.dates["deadline"]; title=self.text["title"]; summ=self.text["summary"]; url=self.text["url"]
+            for i in ids:
+                o=dl[i]
+                if not o: continue
+                out+=["BEGIN:VEVENT", f"SUMMARY:{title[i]} (cierre)", f"DTSTART;VALUE=DATE:{_day(o, '%Y%m%d')}",
+                      f"DTEND;VALUE=DATE:{_day(o+1, '%Y%m%d')}",
+                      f"DESCRIPTION:{(summ[i] or '')[:200].replace(chr(10), ' ')}  URL: {url[i] or ''}", "END:VEVENT"]
+            out.append("END:VCALENDAR")
+            return "\n".join(out)
+        return self._memo("ics", ids, build)
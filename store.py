@@ -0,0 +1,118 @@
+# Artify — store persistente de convocatorias (SQLite)
+# Un registro por (fuente, título normalizado), la misma clave que el dedup. Lo llena `cli.py refresh`
+# (o la UI al forzar actualización) y la UI lo consulta sin rastrear.
+
+import os, time, sqlite3, hashlib, threading
+
+from cache import CACHE_DIR, record_to_json, record_from_json
+from engine import Search, record_key, record_score, near_index
+from records import CallTable
+
+STORE_PATH = os.environ.get("ARTIFY_STORE") or os.path.join(CACHE_DIR, "convocatorias.sqlite")
+STALE_AFTER = 30*24*3600   # sin verlo en 30 días → se borra
+
+class CallStore:
+    def __init__(self, path:str=STORE_PATH):
+        d=os.path.dirname(path)
+        if d: os.makedirs(d, exist_ok=True)
+        self.path=path
+        self._lock=threading.Lock()
+        self._db=sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=10)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("""CREATE TABLE IF NOT EXISTS calls(
+            source TEXT, title_key TEXT, url TEXT, record TEXT, hash TEXT, score INTEGER,
+            first_seen REAL, updated REAL, last_seen REAL, PRIMARY KEY(source, title_key))""")
+        self._db.execute("CREATE TABLE IF NOT EXISTS meta(k TEXT PRIMARY KEY, v TEXT)")
+
+    def upsert(self, rec:dict, now:float=None):
+        # → "new" | "updated" | "same"; ante choque de clave gana el mejor record_score (o la misma URL que cambió);
+        # con el mismo score queda el guardado, como en dedup_records (si no, dos URLs se pisan en cada refresh)
+        now=now or time.time()
+        source, tkey=record_key(rec)
+        txt=record_to_json(rec); h=hashlib.sha1(txt.encode("utf-8")).hexdigest(); sc=record_score(rec)
+        with self._lock:
+            row=self._db.execute("SELECT hash, score, url FROM calls WHERE source=? AND title_key=?", (source, tkey)).fetchone()
+            if row is None:
+                self._db.execute("INSERT INTO calls VALUES (?,?,?,?,?,?,?,?,?)", (source, tkey, rec["url"], txt, h, sc, now, now, now))
+                return "new"
+            if row[0]==h or (sc<=row[1] and rec["url"]!=row[2]):
+                self._db.execute("UPDATE calls SET last_seen=? WHERE source=? AND title_key=?", (now, source, tkey))
+                return "same"
+            self._db.execute("UPDATE calls SET url=?, record=?, hash=?, score=?, updated=?, last_seen=? WHERE source=? AND title_key=?",
+                             (rec["url"], txt, h, sc, now, now, source, tkey))
+            return "updated"
+
+    def upsert_many(self, records):
+        counts={"new":0,"updated":0,"same":0}
+        now=time.time()
+        for r in records:
+            if r: counts[self.upsert(r, now)]+=1
+        return counts
+
+    def records(self):
+        with self._lock:
+            rows=self._db.execute("SELECT record FROM calls").fetchall()
+        return [record_from_json(r[0]) for r in rows]
+
+    def table(self):
+        # lo mismo en columnas (records.CallTable): cada dict se descarta apenas entra, no hay lista de miles de dicts
+        with self._lock:
+            rows=self._db.execute("SELECT record FROM calls").fetchall()
+        return CallTable(record_from_json(r[0]) for r in rows)
+
+    def count(self):
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM calls").fetchone()[0]
+
+    def prune(self, older_than:float=STALE_AFTER):
+        with self._lock:
+            return self._db.execute("DELETE FROM calls WHERE last_seen<?", (time.time()-older_than,)).rowcount
+
+    def set_meta(self, k:str, v):
+        with self._lock:
+            self._db.execute("INSERT OR REPLACE INTO meta VALUES (?,?)", (k, str(v)))
+
+    def get_meta(self, k:str, default=None):
+        with self._lock:
+            row=self._db.execute("SELECT v FROM meta WHERE k=?", (k,)).fetchone()
+        return row[0] if row else default
+
+    @property
+    def version(self):
+        # cambia con cada refresh → la UI sabe cuándo reconstruir el índice
+        with self._lock:
+            row=self._db.execute("SELECT COUNT(*), MAX(updated), MAX(last_seen) FROM calls").fetchone()
+        return f"{row[0]}:{row[1]}:{row[2]}"
+
+    @property
+    def last_refresh(self):
+        v=self.get_meta("last_refresh")
+        return float(v) if v else None
+
+_store=None
+_store_lock=threading.Lock()
+
+def call_store():
+    global _store
+    with _store_lock:
+        if _store is None:
+            try: _store=CallStore()
+            except (OSError, sqlite3.Error): _store=False
+    return _store or None
+
+def refresh(store:CallStore, intensity:int=96, time_limit:float=None, workers:int=16, on_record=None, extract_workers:int=None,
+            near=None, revalidate:bool=False):
+    # rastrea todo (el caché HTTP/de extracción hace que lo que no cambió salga casi gratis) y hace upsert.
+    # Las copias de otra fuente que ya están en el store no se vuelven a parsear (near.seed); siguen hasta el prune.
+    # revalidate (UI: "Forzar actualización"): nada sale del caché HTTP sin preguntarle al sitio (GET condicional).
+    near=near_index() if near is None else near
+    near.seed(store.table().rows())
+    search=Search(intensity, workers=workers, deadline=time.monotonic()+time_limit if time_limit else None,
+                  extract_workers=extract_workers, near=near, revalidate=revalidate)
+    counts={"new":0,"updated":0,"same":0}; now=time.time()
+    for rec, done, total in search:
+        if rec: counts[store.upsert(rec, now)]+=1
+        if on_record: on_record(rec, done, total)
+    counts["pruned"]=store.prune()
+    store.set_meta("last_refresh", now)
+    return counts, search